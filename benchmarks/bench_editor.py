@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Headless timings for the editor hot paths.
+
+Runs CodeEditor and LexerCPP offscreen against generated C++ files and
+prints JSON with per-operation percentiles, so runs can be compared
+between commits:
+
+    python3 benchmarks/bench_editor.py --sizes 1000 10000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from PyQt6.QtCore import QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+from PyQt6.Qsci import QsciScintilla, QSCINTILLA_VERSION_STR
+
+SOURCE_CHUNK = '''#include <bits/stdc++.h>
+using namespace std;
+#define int int64_t
+/* segment tree over
+   the prefix sums */
+const int MOD = 1'000'000'007; // modulus
+template <typename T> struct seg {
+    vector<T> t; int n;
+    seg(int n) : t(2 * n), n(n) {}
+    void update(int p, T v) {
+        for (t[p += n] = v; p > 1; p >>= 1) t[p >> 1] = t[p] + t[p ^ 1];
+    }
+    T query(int l, int r) {
+        T res = 0;
+        for (l += n, r += n; l < r; l >>= 1, r >>= 1) {
+            if (l & 1) res += t[l++];
+            if (r & 1) res += t[--r];
+        }
+        return res;
+    }
+};
+int32_t main() {
+    string s = "hello // world", raw = R"(a\\b)";
+    char c = '\\n';
+    double x = 2.5e-3 + 0x3f;
+    return 0;
+}
+'''
+
+SIZES = [1000, 10000, 100000]
+SELECTION_LINES = 2000
+
+
+def make_source(line_count):
+    chunk = SOURCE_CHUNK.splitlines(True)
+    lines = (chunk * (line_count // len(chunk) + 1))[:line_count]
+    return "".join(lines)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "count": len(ordered),
+        "min": ordered[0],
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+        "mean": sum(ordered) / len(ordered),
+    }
+
+
+def measure(repeat, run, setup=None):
+    """Time run() repeat times in milliseconds, calling setup() untimed first"""
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        run(state)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def new_editor(source, file_path):
+    from editor.code_editor import CodeEditor
+    editor = CodeEditor()
+    editor.resize(1000, 800)
+    editor.setText(source)
+    editor.set_file_path(file_path)
+    return editor
+
+
+def style_all(editor):
+    editor.lexer.style_range(0, editor.length())
+
+
+def bench_full_styling(source, file_path, repeat):
+    def setup():
+        return new_editor(source, file_path)
+    return measure(repeat, style_all, setup)
+
+
+def bench_incremental_styling(editor, repeat):
+    # One keystroke in the middle of the viewport, then the repaint styling pass
+    def run(_):
+        line = editor.firstVisibleLine() + 10
+        editor.insertAt("x", line, 4)
+        start = editor.SendScintilla(QsciScintilla.SCI_GETENDSTYLED)
+        editor.SendScintilla(QsciScintilla.SCI_COLOURISE, start, -1)
+    return measure(repeat, run)
+
+
+def select_block(editor, line_count):
+    # Keep lines free above and below so block moves are never no-ops
+    line_count = max(min(line_count, editor.lines() // 4), 1)
+    first = editor.lines() // 2 - line_count // 2
+    last = first + line_count - 1
+    editor.setSelection(first, 0, last, len(editor.text(last)))
+
+
+def bench_toggle_comment(editor, repeat):
+    def setup():
+        select_block(editor, SELECTION_LINES)
+    return measure(repeat, lambda _: editor.toggle_comment(), setup)
+
+
+def bench_move_line(editor, repeat, move, selection_lines):
+    def setup():
+        if selection_lines:
+            select_block(editor, selection_lines)
+        else:
+            editor.setCursorPosition(editor.lines() // 2, 0)
+    return measure(repeat, lambda _: move(), setup)
+
+
+def bench_snippet(editor, repeat):
+    from utils.snippet_manager import SnippetManager
+    body = SnippetManager().get_snippet_body("Template") or SOURCE_CHUNK
+
+    def setup():
+        editor.setCursorPosition(editor.lines() // 2, 0)
+    return measure(repeat, lambda _: editor.snippet_handler.insert_snippet(body), setup)
+
+
+def bench_open_file(file_path, repeat):
+    from ui.tab_manager import TabManager
+    manager = TabManager()
+
+    def run(_):
+        manager.open_file(file_path)
+
+    def setup():
+        while manager.count():
+            manager.close_tab(0)
+    return measure(repeat, run, setup)
+
+
+def bench_size(line_count, repeat, work_dir):
+    source = make_source(line_count)
+    file_path = os.path.join(work_dir, "bench_%d.cpp" % line_count)
+    with open(file_path, 'w') as f:
+        f.write(source)
+
+    editor = new_editor(source, file_path)
+    style_all(editor)
+
+    results = {
+        "full_styling": bench_full_styling(source, file_path, max(repeat // 4, 3)),
+        "incremental_styling": bench_incremental_styling(editor, repeat),
+        "toggle_comment": bench_toggle_comment(editor, max(repeat // 4, 3)),
+        "move_line_up": bench_move_line(editor, repeat, editor.move_line_up, 0),
+        "move_line_down": bench_move_line(editor, repeat, editor.move_line_down, 0),
+        "move_block_up": bench_move_line(editor, repeat, editor.move_line_up, SELECTION_LINES),
+        "move_block_down": bench_move_line(editor, repeat, editor.move_line_down, SELECTION_LINES),
+        "snippet_insert": bench_snippet(editor, repeat),
+        "open_file": bench_open_file(file_path, max(repeat // 4, 3)),
+    }
+    return {"lines": line_count, "bytes": len(source.encode()), "operations": results}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark editor hot paths headlessly")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="file sizes in lines")
+    parser.add_argument("--repeat", type=int, default=20, help="samples per operation")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        runs = [bench_size(size, args.repeat, work_dir) for size in args.sizes]
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "qscintilla": QSCINTILLA_VERSION_STR,
+        "unit": "ms",
+        "results": runs,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
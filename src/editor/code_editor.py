@@ -1,12 +1,17 @@
-from PyQt6.QtWidgets import QWidget
+from PyQt6.QtWidgets import QWidget, QToolTip
 from PyQt6.Qsci import QsciScintilla, QsciLexerPython
 from PyQt6.QtGui import QFont, QColor, QKeyEvent
-from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtCore import Qt, QEvent, QPoint
 from .custom_lexer import LexerCPP
 from utils.properties import *
 from .find_replace_dialog import FindReplaceDialog
 from .snippet_handler import SnippetHandler
 
+# Higher markers are drawn on top, so an error shows over a warning on the same line
+WARNING_MARKER = 9
+ERROR_MARKER = 10
+DIAGNOSTIC_DWELL_MS = 400
+
 class CodeEditor(QsciScintilla):
     def __init__(self):
         super().__init__()
@@ -16,6 +21,8 @@ class CodeEditor(QsciScintilla):
         self.replace_dialog = None
         self.snippet_handler = SnippetHandler(self)
         self.file_path = None
+        self.diagnostics = []
+        self.init_diagnostics()
         
         # Enable focus and keyboard tracking
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -58,6 +65,80 @@ class CodeEditor(QsciScintilla):
         
         self.lexer = None
 
+    def init_diagnostics(self):
+        self.error_indicator = self.indicatorDefine(QsciScintilla.IndicatorStyle.SquiggleIndicator)
+        self.warning_indicator = self.indicatorDefine(QsciScintilla.IndicatorStyle.SquiggleIndicator)
+        self.markerDefine(QsciScintilla.MarkerSymbol.Circle, ERROR_MARKER)
+        self.markerDefine(QsciScintilla.MarkerSymbol.Circle, WARNING_MARKER)
+        self.set_diagnostic_colors()
+        self.SendScintilla(QsciScintilla.SCI_SETMOUSEDWELLTIME, DIAGNOSTIC_DWELL_MS)
+        self.SCN_DWELLSTART.connect(self.show_diagnostic_tip)
+        self.SCN_DWELLEND.connect(lambda position, x, y: QToolTip.hideText())
+
+    def set_diagnostic_colors(self):
+        for indicator, marker, color in (
+            (self.error_indicator, ERROR_MARKER, EDITOR_ERROR_COLOR),
+            (self.warning_indicator, WARNING_MARKER, EDITOR_WARNING_COLOR),
+        ):
+            self.setIndicatorForegroundColor(color, indicator)
+            self.setMarkerBackgroundColor(color, marker)
+            self.setMarkerForegroundColor(color, marker)
+
+    def set_diagnostics(self, diagnostics):
+        """Underline diagnostics and mark their lines, replacing the ones shown before"""
+        length = self.length()
+        for indicator in (self.error_indicator, self.warning_indicator):
+            self.SendScintilla(QsciScintilla.SCI_SETINDICATORCURRENT, indicator)
+            self.SendScintilla(QsciScintilla.SCI_INDICATORCLEARRANGE, 0, length)
+        self.markerDeleteAll(ERROR_MARKER)
+        self.markerDeleteAll(WARNING_MARKER)
+        self.diagnostics = diagnostics
+
+        # Warnings first so an error over the same text wins the tooltip
+        order = sorted(range(len(diagnostics)), key=lambda i: diagnostics[i].kind == "error")
+        for i in order:
+            diagnostic = diagnostics[i]
+            error = diagnostic.kind == "error"
+            start, end = self.diagnostic_range(diagnostic)
+            self.SendScintilla(QsciScintilla.SCI_SETINDICATORCURRENT, self.error_indicator if error else self.warning_indicator)
+            # The value leads back to the diagnostic after edits have moved the text
+            self.SendScintilla(QsciScintilla.SCI_SETINDICATORVALUE, i + 1)
+            self.SendScintilla(QsciScintilla.SCI_INDICATORFILLRANGE, start, end - start)
+            self.markerAdd(self.SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, start), ERROR_MARKER if error else WARNING_MARKER)
+
+    def diagnostic_range(self, diagnostic):
+        """(start, end) positions of a diagnostic, at least one character wide"""
+        def position(line, column):
+            line = min(max(line - 1, 0), self.lines() - 1)
+            line_start = self.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, line)
+            line_end = self.SendScintilla(QsciScintilla.SCI_GETLINEENDPOSITION, line)
+            return min(line_start + max(column - 1, 0), line_end), line_start, line_end
+
+        start, line_start, line_end = position(diagnostic.line, diagnostic.column)
+        if diagnostic.end_line:
+            end = position(diagnostic.end_line, diagnostic.end_column)[0]
+        else:
+            end = self.SendScintilla(QsciScintilla.SCI_WORDENDPOSITION, start, True)
+        if end <= start:
+            if start < line_end:
+                end = start + 1
+            else:
+                # Past the last character, as in "expected ';'" at the end of a line
+                start, end = max(start - 1, line_start), start
+        return start, end
+
+    def show_diagnostic_tip(self, position, x, y):
+        if position < 0 or not self.diagnostics:
+            return
+        messages = []
+        for indicator in (self.error_indicator, self.warning_indicator):
+            value = self.SendScintilla(QsciScintilla.SCI_INDICATORVALUEAT, indicator, position)
+            if 0 < value <= len(self.diagnostics):
+                diagnostic = self.diagnostics[value - 1]
+                messages.append(f"{diagnostic.kind}: {diagnostic.message}")
+        if messages:
+            QToolTip.showText(self.viewport().mapToGlobal(QPoint(x, y)), "\n".join(messages), self)
+
     def init_custom_behavior(self):
         self.keyPressEvent = self.custom_key_press_event
 
@@ -471,10 +552,12 @@ class CodeEditor(QsciScintilla):
         self.setCaretForegroundColor(EDITOR_CARET_COLOR)
         self.setCaretLineBackgroundColor(EDITOR_CARET_LINE_COLOR)
         self.setMarginsBackgroundColor(EDITOR_MARGIN_BACKGROUND_COLOR)
+        self.setFoldMarginColors(EDITOR_MARGIN_BACKGROUND_COLOR, EDITOR_MARGIN_BACKGROUND_COLOR)
         self.setMatchedBraceBackgroundColor(EDITOR_BRACE_MATCHED_BG_COLOR)
         self.setMatchedBraceForegroundColor(EDITOR_BRACE_MATCHED_FG_COLOR)
         self.setUnmatchedBraceBackgroundColor(EDITOR_BRACE_UNMATCHED_BG_COLOR)
         self.setUnmatchedBraceForegroundColor(EDITOR_BRACE_UNMATCHED_FG_COLOR)
+        self.set_diagnostic_colors()
         
         if self.lexer:
             self.lexer.init_colors()
@@ -497,4 +580,9 @@ class CodeEditor(QsciScintilla):
             self.setLexer(self.lexer)
             self.lexer.setDefaultPaper(EDITOR_BACKGROUND_COLOR)
             if hasattr(self.lexer, 'init_colors'):
-                self.lexer.init_colors()
\ No newline at end of file
+                self.lexer.init_colors()
+            # Fold levels are set by LexerCPP while styling
+            self.setFolding(QsciScintilla.FoldStyle.BoxedTreeFoldStyle, 2)
+            self.setFoldMarginColors(EDITOR_MARGIN_BACKGROUND_COLOR, EDITOR_MARGIN_BACKGROUND_COLOR)
+        else:
+            self.setFolding(QsciScintilla.FoldStyle.NoFoldStyle, 2)
\ No newline at end of file
@@ -1,5 +1,7 @@
 import re
-from PyQt6.Qsci import QsciLexerCustom
+import time
+from PyQt6.Qsci import QsciLexerCustom, QsciScintilla
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QColor, QFont
 from utils.properties import *
 
@@ -51,6 +53,96 @@ class LexerCPP(QsciLexerCustom):
         ".", ",","->", "!", "~", "+", "&",
     ]
     
+    # Per-line lexer states stored with SCI_SETLINESTATE. A line's state
+    # says which multi-line token, if any, is still open at its end. Raw
+    # strings keep the index of their delimiter in the middle bits, and the
+    # fold depth at the end of the line sits in the upper bits.
+    STATE_DEFAULT = 0
+    STATE_PREPROCESSOR = 1
+    STATE_BLOCK_COMMENT = 2
+    STATE_LINE_COMMENT = 3
+    STATE_STRING = 4
+    STATE_RAW_STRING = 5
+    STATE_KIND_MASK = 0xFF
+    STATE_DELIMITER_SHIFT = 8
+    STATE_DEPTH_SHIFT = 20
+    STATE_LEXER_MASK = (1 << STATE_DEPTH_SHIFT) - 1
+    RAW_DELIMITER_LIMIT = 1 << (STATE_DEPTH_SHIFT - STATE_DELIMITER_SHIFT)
+    MAX_FOLD_DEPTH = 0x7FF
+
+    # Number of lines read per SCI_GETTEXTRANGE call while lexing
+    block_lines = 256
+
+    # Text outside the viewport is styled in slices of at most
+    # idle_budget seconds, starting idle_delay ms after the last edit
+    idle_budget = 0.008
+    idle_delay = 50
+
+    # Single-pass scanner over a block of raw document bytes. Parentheses
+    # and symbols are styled per character through char_styles; the scanner
+    # only matches tokens whose style depends on context. Every alternative
+    # is a named group so the matched group name is enough to pick the style,
+    # and keyword/type lookup happens inside the compiled pattern instead of
+    # in list scans. Comments, strings and directives may run over several
+    # lines through backslash continuations (or, for block comments and raw
+    # strings, freely) and stop at the end of the block when unterminated.
+    token_pattern = re.compile(
+        rb"(?m)^[ \t]*(?P<Preprocessor>\#(?:[^\\\n/]|\\(?:\r?\n)?|/(?![/*]))*)"
+        rb"|(?P<Comment>/\*(?s:.*?)(?:\*/|\Z))"
+        rb"|(?P<DoubleSlashComment>//(?:[^\\\n]|\\(?:\r?\n)?)*)"
+        rb"|(?=[uULR])(?P<RawString>(?:(?<!\w)(?:u8|[uUL])R|(?<!\w)R)\"(?P<delimiter>[^ ()\\\t\v\f\r\n\"]{0,16})\("
+        rb"(?s:.*?)(?:\)(?P=delimiter)\"|\Z))"
+        rb"|(?=[uUL\"'])(?P<String>(?:(?<!\w)(?:u8|[uUL]))?"
+        rb"(?:\"(?:[^\"\\\n]|\\(?:\r?\n|.))*\"?|'(?:[^'\\\n]|\\.)*'?))"
+        rb"|\b(?=[a-z])(?:"
+        rb"(?P<Keyword>" + b"|".join(word.encode() for word in keyword_list) + rb")"
+        rb"|(?P<Type>" + b"|".join(word.encode() for word in type_list) + rb"))\b"
+        rb"|(?=[0-9.])(?<![\w.])(?P<Number>(?:"
+        rb"0[xX][0-9a-fA-F']*(?:\.[0-9a-fA-F']*)?(?:[pP][-+]?[0-9]+)?"
+        rb"|0[bB][01']+"
+        rb"|(?:[0-9][0-9']*\.?[0-9']*|\.[0-9][0-9']*)(?:[eE][-+]?[0-9][0-9']*)?"
+        rb")\w*)"
+    )
+
+    # Braces and conditional directives that open or close a fold
+    brace_pattern = re.compile(rb"[{}]")
+    directive_pattern = re.compile(rb"\#[ \t]*(if|ifdef|ifndef|elif|elifdef|elifndef|else|endif)\b")
+    directive_folds = {
+        b"if": (1,), b"ifdef": (1,), b"ifndef": (1,),
+        b"elif": (-1, 1), b"elifdef": (-1, 1), b"elifndef": (-1, 1), b"else": (-1, 1),
+        b"endif": (-1,),
+    }
+
+    # Style of each scanner group
+    group_styles = dict(styles, RawString=styles["String"])
+
+    # Translation table from document bytes to their context-free style
+    char_styles = bytearray(256)
+    for char in "".join(symbol_list):
+        char_styles[ord(char)] = styles["Symbol"]
+    for char in "".join(parantheses_list):
+        char_styles[ord(char)] = styles["Parantheses"]
+    char_styles = bytes(char_styles)
+    del char
+
+    # Rest of a token left open at the end of the previous line, keyed by
+    # the state the previous line ended in
+    continuation_patterns = {
+        STATE_PREPROCESSOR: (re.compile(rb"(?:[^\\\n/]|\\(?:\r?\n)?|/(?![/*]))*"), "Preprocessor"),
+        STATE_BLOCK_COMMENT: (re.compile(rb"(?s:.*?)(?:\*/|\Z)"), "Comment"),
+        STATE_LINE_COMMENT: (re.compile(rb"(?:[^\\\n]|\\(?:\r?\n)?)*"), "DoubleSlashComment"),
+        STATE_STRING: (re.compile(rb"(?:[^\"\\\n]|\\(?:\r?\n|.))*\"?"), "String"),
+    }
+
+    # State of a line that ends inside a token of each multi-line group
+    multiline_states = {
+        "Preprocessor": STATE_PREPROCESSOR,
+        "Comment": STATE_BLOCK_COMMENT,
+        "DoubleSlashComment": STATE_LINE_COMMENT,
+        "String": STATE_STRING,
+        "RawString": STATE_RAW_STRING,
+    }
+
     # Default colors in case properties are not available
     default_colors = {
         "Default": "#FFFFFF",
@@ -78,6 +170,21 @@ class LexerCPP(QsciLexerCustom):
         for i in range(len(self.styles)):
             self.setFont(EDITOR_FONT, i)
 
+        # End of the region styled so far and the last line touched by an
+        # edit since the last styling pass, kept up to date from SCN_MODIFIED
+        self.styled_end = 0
+        self.dirty_line = -1
+        parent.SCN_MODIFIED.connect(self.on_modified)
+
+        # Raw string delimiters seen so far; a raw string state refers to one
+        # by its index
+        self.raw_delimiters = [b""]
+        self.raw_delimiter_ids = {b"": 0}
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.style_in_background)
+
     def init_colors(self):
         # Helper function to get color safely
         def get_color(style_name):
@@ -107,47 +214,262 @@ class LexerCPP(QsciLexerCustom):
         return description
 
     def styleText(self, start, end):
-        self.startStyling(start)
+        # Scintilla asks for everything up to the position it needs at once,
+        # which is the whole document when the lexer is first set. Style only
+        # what is on screen now and leave the rest to idle-time styling.
+        visible_end = self.visible_end()
+        if end > visible_end:
+            end = max(visible_end, start)
+            self.idle_timer.start(0)
+        self.style_range(start, end)
 
-        text = self.parent().text()[start:end]
-        
-        lines = text.split('\n')
-        pos = 0
-        
-        for line in lines:
-            stripped_line = line.lstrip()
-            if stripped_line.startswith('#'):
-                leading_spaces = len(line) - len(stripped_line)
-                if leading_spaces > 0:
-                    self.setStyling(leading_spaces, self.styles["Default"])
-                    pos += leading_spaces
-                self.setStyling(len(line) - leading_spaces, self.styles["Preprocessor"])
-                pos += len(line) - leading_spaces
-            elif stripped_line.startswith('//'):
-                leading_spaces = len(line) - len(stripped_line)
-                if leading_spaces > 0:
-                    self.setStyling(leading_spaces, self.styles["Default"])
-                    pos += leading_spaces
-                self.setStyling(len(line) - leading_spaces, self.styles["DoubleSlashComment"])
-                pos += len(line) - leading_spaces
-            else:
-                tokens = re.findall(r'(\{\.|\.\}|\#|\'|\"\"\"|\s+|\w+|\W)', line)
-                for token in tokens:
-                    token_len = len(token)
-                    if token in self.keyword_list:
-                        self.setStyling(token_len, self.styles["Keyword"])
-                    elif token in self.type_list:
-                        self.setStyling(token_len, self.styles["Type"])
-                    elif token in self.number_list:
-                        self.setStyling(token_len, self.styles["Number"])
-                    elif token in self.symbol_list:
-                        self.setStyling(token_len, self.styles["Symbol"])
-                    elif token in self.parantheses_list:
-                        self.setStyling(token_len, self.styles["Parantheses"])
-                    else:
-                        self.setStyling(token_len, self.styles["Default"])
-                    pos += token_len
-            
-            if pos < len(text):
-                self.setStyling(1, self.styles["Default"])
-                pos += 1
\ No newline at end of file
+    def style_in_background(self):
+        """Style the next slices of text past the styled region"""
+        editor = self.parent()
+        deadline = time.perf_counter() + self.idle_budget
+        while time.perf_counter() < deadline:
+            start = editor.SendScintilla(QsciScintilla.SCI_GETENDSTYLED)
+            if start >= editor.length():
+                return
+            self.style_range(start, start)
+        self.idle_timer.start(0)
+
+    def visible_end(self):
+        editor = self.parent()
+        first_line = editor.SendScintilla(QsciScintilla.SCI_GETFIRSTVISIBLELINE)
+        last_line = first_line + editor.SendScintilla(QsciScintilla.SCI_LINESONSCREEN) + 1
+        line = editor.SendScintilla(QsciScintilla.SCI_DOCLINEFROMVISIBLE, last_line)
+        return editor.SendScintilla(QsciScintilla.SCI_GETLINEENDPOSITION, line)
+
+    def style_range(self, start, end):
+        """Style whole lines from the one containing start to the one containing end"""
+        editor = self.parent()
+        line = editor.SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, start)
+        last_line = max(
+            editor.SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, end),
+            self.dirty_line,
+        )
+        line_count = editor.lines()
+        position = editor.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, line)
+        state = self.line_state(line - 1)
+        depth = state >> self.STATE_DEPTH_SHIFT
+        state &= self.STATE_LEXER_MASK
+        # Lines from here on have never been styled, so their stored states
+        # mean nothing
+        styled_line = editor.SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, self.styled_end)
+
+        style_start = position
+        self.style_buffer = bytearray()
+        converged = False
+
+        # Lex a block of lines at a time, carrying the end-of-line state
+        # forward. Past the requested range, once a line's end state agrees
+        # with the one stored on a previous pass everything after it is still
+        # styled correctly. If it never agrees, the rest is left unstyled for
+        # style_in_background to pick up.
+        while line < line_count:
+            # A block adds at most one delimiter per line
+            if len(self.raw_delimiters) > self.RAW_DELIMITER_LIMIT - self.block_lines:
+                state = self.compact_raw_delimiters(state)
+            block_end = min(line + self.block_lines, line_count)
+            end_position = editor.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, block_end)
+            if block_end == line_count:
+                end_position = editor.length()
+            block = self.read_range(position, end_position)
+
+            states, depths, levels = self.lex_block(block, state, depth, block_end - line)
+
+            for new_state, new_depth, level in zip(states, depths, levels):
+                new_state |= new_depth << self.STATE_DEPTH_SHIFT
+                if last_line <= line < styled_line:
+                    converged = new_state == editor.SendScintilla(QsciScintilla.SCI_GETLINESTATE, line)
+                editor.SendScintilla(QsciScintilla.SCI_SETLINESTATE, line, new_state)
+                editor.SendScintilla(QsciScintilla.SCI_SETFOLDLEVEL, line, level)
+                line += 1
+                if converged:
+                    break
+            if converged:
+                # Keep the stored styles and states after the converged line
+                line_position = editor.SendScintilla(QsciScintilla.SCI_POSITIONFROMLINE, line)
+                del self.style_buffer[len(self.style_buffer) - (end_position - line_position):]
+                position = line_position
+                break
+            if states:
+                state = states[-1]
+                depth = depths[-1]
+            position = end_position
+            if line > last_line:
+                break
+
+        self.apply_styles(style_start)
+
+        self.dirty_line = -1
+        if converged and position < self.styled_end:
+            # Text past the convergence point was styled on an earlier pass
+            # and is unaffected by this edit; mark it as styled again.
+            editor.SendScintilla(QsciScintilla.SCI_STARTSTYLING, min(self.styled_end, editor.length()), 0)
+        else:
+            self.styled_end = position
+
+    def apply_styles(self, position):
+        """Send the accumulated style bytes to Scintilla in a single call"""
+        editor = self.parent()
+        editor.SendScintilla(QsciScintilla.SCI_STARTSTYLING, position, 0)
+        if self.style_buffer:
+            editor.SendScintilla(QsciScintilla.SCI_SETSTYLINGEX, len(self.style_buffer), bytes(self.style_buffer))
+        self.style_buffer = bytearray()
+
+    def read_range(self, start, end):
+        """Read the raw document bytes in [start, end) without copying the whole text"""
+        if end <= start:
+            return b""
+        return bytes(self.parent().bytes(start, end))[:end - start]
+
+    def line_state(self, line):
+        if line < 0:
+            return self.STATE_DEFAULT
+        return self.parent().SendScintilla(QsciScintilla.SCI_GETLINESTATE, line)
+
+    def on_modified(self, position, modification_type, text, length, lines_added, *args):
+        if modification_type & QsciScintilla.SC_MOD_INSERTTEXT:
+            if position < self.styled_end:
+                self.styled_end += length
+        elif modification_type & QsciScintilla.SC_MOD_DELETETEXT:
+            if position < self.styled_end:
+                self.styled_end = max(position, self.styled_end - length)
+        else:
+            return
+        self.idle_timer.start(self.idle_delay)
+        # Lines created or merged by the edit carry copies of their
+        # neighbours' states, so convergence is only checked from the first
+        # line after them, whose text and stored state are both unchanged.
+        line = self.parent().SendScintilla(QsciScintilla.SCI_LINEFROMPOSITION, position)
+        self.dirty_line = max(self.dirty_line, line + max(lines_added, 0) + 1)
+
+    def lex_block(self, text, state, depth, line_count):
+        """Append the styles of a block of whole lines to the style buffer; returns each line's end state, fold depth and fold level"""
+        group_styles = self.group_styles
+        multiline_states = self.multiline_states
+        states = [self.STATE_DEFAULT] * line_count
+        directives = []
+        buffer = bytearray(text.translate(self.char_styles))
+
+        # Finish the token the previous line left open
+        position = 0
+        kind = state & self.STATE_KIND_MASK
+        if kind == self.STATE_RAW_STRING:
+            closing = b")" + self.raw_delimiters[state >> self.STATE_DELIMITER_SHIFT] + b'"'
+            position = text.find(closing)
+            position = len(text) if position < 0 else position + len(closing)
+            group = "RawString"
+        elif kind != self.STATE_DEFAULT:
+            pattern, group = self.continuation_patterns[kind]
+            position = pattern.match(text).end()
+        if position:
+            buffer[:position] = bytes((group_styles[group],)) * position
+            for index in range(text.count(b"\n", 0, position)):
+                states[index] = state
+
+        line = 0
+        line_position = 0
+        for match in self.token_pattern.finditer(text, position):
+            group = match.lastgroup
+            token_start, token_end = match.span(group)
+            buffer[token_start:token_end] = bytes((group_styles[group],)) * (token_end - token_start)
+
+            if group == "Preprocessor":
+                directive = self.directive_pattern.match(text, token_start)
+                if directive:
+                    for delta in self.directive_folds[directive.group(1)]:
+                        directives.append((token_start, delta))
+
+            if group in multiline_states:
+                newlines = text.count(b"\n", token_start, token_end)
+                if newlines:
+                    line += text.count(b"\n", line_position, token_start)
+                    line_position = token_start
+                    token_state = multiline_states[group]
+                    if group == "RawString":
+                        token_state |= self.raw_delimiter_id(match.group("delimiter")) << self.STATE_DELIMITER_SHIFT
+                    for index in range(line, line + newlines):
+                        states[index] = token_state
+
+        self.style_buffer += buffer
+        depths, levels = self.fold_levels(text, buffer, depth, line_count, directives)
+        return states, depths, levels
+
+    def fold_levels(self, text, buffer, depth, line_count, directives):
+        """Compute fold depths and levels of a styled block from its braces and directives"""
+        brace_style = self.styles["Parantheses"]
+        events = [
+            (match.start(), 1 if match.group() == b"{" else -1)
+            for match in self.brace_pattern.finditer(text)
+            if buffer[match.start()] == brace_style
+        ]
+        if directives:
+            events = sorted(events + directives)
+
+        depths = [depth] * line_count
+        levels = [QsciScintilla.SC_FOLDLEVELBASE + depth] * line_count
+
+        # A line's level is the lowest depth reached on it, so "} else {"
+        # closes one fold and opens the next. It is a fold header when the
+        # depth at its end is higher than that.
+        line = 0
+        line_position = 0
+        lowest = depth
+        for position, delta in events:
+            event_line = line + text.count(b"\n", line_position, position)
+            line_position = position
+            if event_line != line:
+                levels[line] = self.fold_level(lowest, depth)
+                depths[line] = depth
+                levels[line + 1:event_line] = [QsciScintilla.SC_FOLDLEVELBASE + depth] * (event_line - line - 1)
+                depths[line + 1:event_line] = [depth] * (event_line - line - 1)
+                line = event_line
+                lowest = depth
+            depth = min(max(depth + delta, 0), self.MAX_FOLD_DEPTH)
+            lowest = min(lowest, depth)
+
+        if line < line_count:
+            levels[line] = self.fold_level(lowest, depth)
+            levels[line + 1:] = [QsciScintilla.SC_FOLDLEVELBASE + depth] * (line_count - line - 1)
+            depths[line:] = [depth] * (line_count - line)
+        return depths, levels
+
+    def fold_level(self, lowest, depth):
+        level = QsciScintilla.SC_FOLDLEVELBASE + lowest
+        if depth > lowest:
+            level |= QsciScintilla.SC_FOLDLEVELHEADERFLAG
+        return level
+
+    def raw_delimiter_id(self, delimiter):
+        if delimiter not in self.raw_delimiter_ids:
+            if len(self.raw_delimiters) == self.RAW_DELIMITER_LIMIT:
+                # Out of ids; the string is taken to end at the first )"
+                return 0
+            self.raw_delimiter_ids[delimiter] = len(self.raw_delimiters)
+            self.raw_delimiters.append(delimiter)
+        return self.raw_delimiter_ids[delimiter]
+
+    def compact_raw_delimiters(self, state):
+        """Drop the delimiters no line state refers to any more; returns state renumbered to match"""
+        editor = self.parent()
+        delimiters = self.raw_delimiters
+        self.raw_delimiters = [b""]
+        self.raw_delimiter_ids = {b"": 0}
+        id_mask = (self.RAW_DELIMITER_LIMIT - 1) << self.STATE_DELIMITER_SHIFT
+
+        def renumber(value):
+            if value & self.STATE_KIND_MASK != self.STATE_RAW_STRING:
+                return value
+            index = (value & id_mask) >> self.STATE_DELIMITER_SHIFT
+            delimiter = delimiters[index] if index < len(delimiters) else b""
+            return value & ~id_mask | self.raw_delimiter_id(delimiter) << self.STATE_DELIMITER_SHIFT
+
+        for line in range(editor.lines()):
+            value = editor.SendScintilla(QsciScintilla.SCI_GETLINESTATE, line)
+            new_value = renumber(value)
+            if new_value != value:
+                editor.SendScintilla(QsciScintilla.SCI_SETLINESTATE, line, new_value)
+        return renumber(state)
@@ -0,0 +1,94 @@
+/*
+ * Runs a solution under resource limits and reports what it used.
+ *
+ * usage: launcher STATS_FD CPU_SECONDS MEMORY_KB STACK_KB WALL_MS program
+ *
+ * The program is forked from here rather than from the editor because
+ * Linux carries the parent's peak RSS over to a child across fork and
+ * exec, which would put the editor's own memory into every measurement.
+ * A limit of 0 is left unset, except the stack which is then unlimited.
+ * SIGTERM kills the program but still reports. Once the program ends,
+ * "status timed_out utime stime maxrss_kb" is written to STATS_FD.
+ */
+#include <errno.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static pid_t child;
+static volatile sig_atomic_t timed_out;
+
+static void on_alarm(int sig)
+{
+    (void)sig;
+    timed_out = 1;
+    kill(child, SIGKILL);
+}
+
+static void on_term(int sig)
+{
+    (void)sig;
+    kill(child, SIGKILL);
+}
+
+static void set_limit(int resource, rlim_t soft, rlim_t hard)
+{
+    struct rlimit limit;
+    if (getrlimit(resource, &limit) != 0)
+        return;
+    if (limit.rlim_max != RLIM_INFINITY && (hard == RLIM_INFINITY || hard > limit.rlim_max))
+        hard = limit.rlim_max;
+    if (soft == RLIM_INFINITY || soft > hard)
+        soft = hard;
+    limit.rlim_cur = soft;
+    limit.rlim_max = hard;
+    setrlimit(resource, &limit);
+}
+
+int main(int argc, char **argv)
+{
+    if (argc < 7)
+        return 126;
+    int stats_fd = atoi(argv[1]);
+    rlim_t cpu = strtoul(argv[2], NULL, 10);
+    rlim_t memory_kb = strtoul(argv[3], NULL, 10);
+    rlim_t stack_kb = strtoul(argv[4], NULL, 10);
+    long wall_ms = strtol(argv[5], NULL, 10);
+
+    child = fork();
+    if (child < 0)
+        return 126;
+    if (child == 0) {
+        close(stats_fd);
+        if (cpu)
+            set_limit(RLIMIT_CPU, cpu, cpu + 1);
+        if (memory_kb)
+            set_limit(RLIMIT_AS, memory_kb * 1024, memory_kb * 1024);
+        set_limit(RLIMIT_STACK, stack_kb ? stack_kb * 1024 : RLIM_INFINITY, RLIM_INFINITY);
+        execv(argv[6], argv + 6);
+        _exit(127);
+    }
+
+    signal(SIGALRM, on_alarm);
+    signal(SIGTERM, on_term);
+    if (wall_ms > 0) {
+        struct itimerval timer = {{0, 0}, {wall_ms / 1000, (wall_ms % 1000) * 1000}};
+        setitimer(ITIMER_REAL, &timer, NULL);
+    }
+
+    int status;
+    struct rusage usage;
+    while (wait4(child, &status, 0, &usage) < 0) {
+        if (errno != EINTR)
+            return 126;
+    }
+    dprintf(stats_fd, "%d %d %ld.%06ld %ld.%06ld %ld\n", status, (int)timed_out,
+            (long)usage.ru_utime.tv_sec, (long)usage.ru_utime.tv_usec,
+            (long)usage.ru_stime.tv_sec, (long)usage.ru_stime.tv_usec,
+            usage.ru_maxrss);
+    return 0;
+}
@@ -1,21 +1,114 @@
-from PyQt6.QtWidgets import QMessageBox
-from PyQt6.QtCore import QProcess
+from PyQt6.QtWidgets import QMessageBox, QWidget, QHBoxLayout, QLabel, QPushButton
+from PyQt6.QtCore import QProcess, QTimer, QElapsedTimer
 from utils.properties import *
+from utils.pch_cache import PCHCache, PCH_HEADER
+from utils.compile_cache import CompileCache
+from utils.artifact_store import ArtifactStore
+from utils.program_runner import ProgramRunner
+from utils.run_limits import RunLimits, build_launcher
+from utils.run_cache import RunCache
+from utils.speculative_build import SpeculativeBuild
+from utils.test_runner import TestRunner
+from utils.test_store import TestStore, open_test_file
+from utils.stress_tester import StressTester, find_partner, GENERATOR_NAMES, BRUTE_NAMES
+from utils.test_minimizer import TestMinimizer
+from utils.testgen import script_command
+from utils.comparator import Judge, Tolerance, CHECKER_NAMES
+from utils.interactive_runner import InteractiveRunner, INTERACTOR_NAMES
+from utils.syntax_checker import SyntaxChecker
+from .output_sink import OutputSink
+from .run_monitor import RunMonitor
+import codecs
 import os
 import shlex
+import signal
 
 class CompilerManager:
     def __init__(self, parent=None):
         self.parent = parent
         self.process = None
+        self.compile_process = None
+        self.pending_build = None
+        self.current_build = None
+        self.test_runner = None
+        self.stress_tester = None
+        self.stress_failure = None
+        self.minimizer = None
+        self.interactive_runner = None
+        self.speculative = None
+        # A compile waiting for the speculative build of the same source to land in the cache
+        self.awaiting_speculative = None
+        self.launcher = None
+        self.cancelled = False
+        self.elapsed = QElapsedTimer()
+        self.progress_timer = QTimer()
+        self.progress_timer.setInterval(100)
+        self.progress_timer.timeout.connect(self.update_progress)
+        self.stress_timer = QTimer()
+        self.stress_timer.setInterval(250)
+        self.stress_timer.timeout.connect(self.update_stress_progress)
         os.makedirs(BIN_DIR, exist_ok=True)
+        self.pch_cache = PCHCache(os.path.join(BIN_DIR, "pch"))
+        self.syntax_checker = SyntaxChecker(self.pch_cache)
+        self.artifacts = ArtifactStore(os.path.join(BIN_DIR, "artifacts"), ARTIFACT_MAX_MB * 1024 * 1024, ARTIFACTS_IN_RAM)
+        self.compile_cache = CompileCache(os.path.join(BIN_DIR, "cache"), COMPILE_CACHE_MAX_MB * 1024 * 1024)
+        self.run_cache = RunCache(os.path.join(BIN_DIR, "runs"), RUN_CACHE_MAX_MB * 1024 * 1024)
+        self.setup_status_widget()
+        self.run_monitor = RunMonitor(self.kill_run)
 
-    def get_executable_path(self, source_file):
-        """Get path for executable with unique name based on source file"""
-        base_name = os.path.splitext(os.path.basename(source_file))[0]
-        return os.path.join(BIN_DIR, base_name)
+    def setup_status_widget(self):
+        self.status_widget = QWidget()
+        layout = QHBoxLayout(self.status_widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
 
-    def compile_and_run(self, source_path, debug=False):
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("QLabel { color: #d8dee9; padding: 2px 8px; }")
+        layout.addWidget(self.status_label)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setFlat(True)
+        self.cancel_button.setStyleSheet("""
+            QPushButton {
+                color: #d8dee9;
+                padding: 0px 6px;
+                border: 1px solid #555555;
+            }
+            QPushButton:hover {
+                background-color: #AA0000;
+            }
+        """)
+        self.cancel_button.clicked.connect(self.cancel)
+        self.cancel_button.hide()
+        layout.addWidget(self.cancel_button)
+
+    def get_status_widget(self):
+        return self.status_widget
+
+    def get_monitor_widget(self):
+        return self.run_monitor
+
+    def kill_run(self):
+        if self.process and self.process.is_running():
+            self.process.kill()
+
+    def is_compiling(self):
+        return self.compile_process is not None
+
+    def run_limits(self, time_limit):
+        if self.launcher is None:
+            self.launcher = build_launcher(os.path.join(BIN_DIR, "launcher")) or ""
+        return RunLimits(time_limit, RUN_MEMORY_LIMIT_MB, RUN_STACK_MB, self.launcher)
+
+    def tolerance(self):
+        return Tolerance(COMPARE_ABS_TOLERANCE, COMPARE_REL_TOLERANCE)
+
+    def get_executable_path(self, source_file, variant="release"):
+        """Get path for executable unique to the source's full path and build variant"""
+        return self.artifacts.executable_path(source_file, variant)
+
+    def compile_and_run(self, source_path, debug=False, run_tests=False, fresh=False):
+        """Build source_path and run it; fresh runs it even if the same run is cached"""
         if not source_path:
             QMessageBox.warning(self.parent, "Warning", "No file is currently open")
             return
@@ -23,72 +116,644 @@ class CompilerManager:
             QMessageBox.warning(self.parent, "Warning", "Not a C++ file")
             return
 
-        working_dir = os.path.dirname(source_path)
-        executable = self.get_executable_path(source_path)
-        
-        if self.process and self.process.state() == QProcess.ProcessState.Running:
+        # Presses during a build collapse into a single rebuild once it finishes
+        self.pending_build = (source_path, debug, run_tests, fresh)
+        if self.is_compiling():
+            self.status_label.setText(f"Compiling {os.path.basename(self.current_build['source'])}... (rebuild queued)")
+            return
+        self.start_compile()
+
+    def start_compile(self):
+        source_path, debug, run_tests, fresh = self.pending_build
+        self.pending_build = None
+        self.cancelled = False
+
+        if not self.save_buffer(source_path):
+            return
+
+        self.stop_program()
+
+        build = self.prepare_build(source_path, "debug" if debug else "release")
+        build["run_tests"] = run_tests
+        build["fresh"] = fresh
+        self.parent.io_manager.diagnostics_panel.start(source_path, build["working_dir"])
+        if self.speculative and not build["cached"]:
+            if self.speculative.covers(build["cache_key"]):
+                self.awaiting_speculative = ((source_path, debug, run_tests, fresh), build["cache_key"])
+                self.cancel_button.show()
+                self.status_label.setText(f"Finishing background build of {os.path.basename(source_path)}...")
+                return
+            # Stale; don't let it compete with this build
+            self.speculative.cancel()
+        if build["cached"]:
+            self.status_label.setText(f"{os.path.basename(source_path)} is up to date")
+            # The warnings of the build that was cached, as if it had just compiled
+            panel = self.parent.io_manager.diagnostics_panel
+            panel.feed(build.get("diagnostics", ""))
+            panel.finish()
+            self.run_executable(build["executable"], build["working_dir"], source_path, run_tests, fresh)
+            return
+
+        self.current_build = build
+        build["stderr"] = []
+        # gcc's quotes are multibyte, and a read can end in the middle of one
+        build["decoder"] = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.compile_process = QProcess()
+        self.compile_process.setWorkingDirectory(build["working_dir"])
+        # Own session so cancelling also stops cc1plus/ld, not just the shell
+        if hasattr(self.compile_process, 'setUnixProcessParameters'):
+            self.compile_process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+        self.compile_process.finished.connect(self.on_compile_finished)
+        process = self.compile_process
+        self.compile_process.readyReadStandardError.connect(lambda: self.on_compile_output(process))
+        self.compile_process.errorOccurred.connect(self.on_compile_error)
+        self.compile_process.start('/bin/sh', ['-c', build["shell_command"]])
+
+        self.elapsed.start()
+        self.progress_timer.start()
+        self.cancel_button.show()
+        self.update_progress()
+
+    def stop_program(self):
+        """Kill the program started from the IO pane, which may hold the executable open"""
+        if self.process and self.process.is_running():
             self.process.kill()
-            self.process.waitForFinished()
+            self.process.wait()
             self.process = None
+            self.run_monitor.stop()
 
-        compile_cmd = COMPILE_DEBUG_CMD if debug else COMPILE_RELEASE_CMD
-        compile_cmd = compile_cmd.format(
-            executable=executable,
-            source=source_path
-        )
-
-        compile_process = QProcess()
-        compile_process.setWorkingDirectory(working_dir)
-        compile_process.start('/bin/sh', ['-c', compile_cmd])
-        compile_process.waitForFinished()
-
-        if compile_process.exitCode() != 0:
-            error = compile_process.readAllStandardError().data().decode()
-            
-            # Write compilation error to output.txt instead of showing popup
-            self.parent.io_manager.output_editor.setText(error)
+    def prepare_build(self, source_path, variant, output=None):
+        """Describe a build of source_path; a cached one is restored to the executable unless building to output"""
+        executable = self.get_executable_path(source_path, variant)
+        compile_cmd = COMPILE_DEBUG_CMD if variant == "debug" else COMPILE_RELEASE_CMD
+        expanded_cmd = compile_cmd.format(executable=executable, source=source_path)
+        build = {
+            "source": source_path,
+            "executable": executable,
+            "working_dir": os.path.dirname(source_path),
+            "variant": variant,
+            "command": expanded_cmd,
+            # The PCH only changes build speed, so it is left out of the cache key
+            "cache_key": self.compile_cache.key(source_path, expanded_cmd),
+            "cached": False,
+            "output": output or executable,
+        }
+        cached = self.compile_cache.lookup(build["cache_key"])
+        if cached:
+            build["diagnostics"] = cached[1]
+        if cached and output:
+            build["cached"] = True
+            return build
+        if cached:
             try:
-                with open(OUTPUT_PATH, 'w') as f:
-                    f.write(error)
-            except Exception as e:
-                QMessageBox.critical(self.parent, "Error", f"Could not save output: {str(e)}")
-            
-            # Make sure the IO widget is visible to show the error
-            if not self.parent.io_manager.io_widget.isVisible():
-                self.parent.io_manager.toggle_view()
-                
-            return
-
-        if self.parent.io_manager.io_widget.isVisible():
-            self.run_with_io(executable, working_dir)
+                self.compile_cache.restore(cached[0], executable)
+                self.artifacts.record(source_path, variant, expanded_cmd)
+                build["cached"] = True
+                return build
+            except OSError:
+                pass
+
+        pch_flag = self.get_pch_flag(source_path, compile_cmd)
+        if pch_flag:
+            compile_cmd = f"{compile_cmd} {pch_flag}"
+        build["shell_command"] = compile_cmd.format(executable=build["output"], source=source_path)
+        return build
+
+    def store_build(self, build, diagnostics=None):
+        # Only successful builds are cached; a failure may be transient (e.g. the old binary still running)
+        if diagnostics is None:
+            diagnostics = build.get("diagnostics", "")
+        self.compile_cache.store(build["cache_key"], build["source"], build["command"], build["output"], diagnostics)
+        if build["output"] == build["executable"]:
+            self.artifacts.record(build["source"], build["variant"], build["shell_command"])
+        else:
+            try:
+                os.remove(build["output"])
+            except OSError:
+                pass
+
+    def speculative_build(self, source_path):
+        """Start building a just saved source in the background, replacing builds of older saves"""
+        if not SPECULATIVE_BUILD or not source_path or not source_path.endswith('.cpp'):
+            return
+        if self.speculative:
+            self.speculative.cancel()
+        variants = ["release", "debug"] if SPECULATIVE_BUILD_DEBUG else ["release"]
+        # Built aside and stored in the compile cache, so a program still running from the real path is never overwritten
+        scratch = os.path.join(BIN_DIR, "speculative")
+        os.makedirs(scratch, exist_ok=True)
+        builds = []
+        for variant in variants:
+            output = os.path.join(scratch, os.path.basename(self.artifacts.artifact_dir(source_path, variant)))
+            build = self.prepare_build(source_path, variant, output)
+            if not build["cached"] and build["cache_key"]:
+                builds.append(build)
+        if not builds:
+            self.speculative = None
+            return
+        worker = SpeculativeBuild(builds, SPECULATIVE_BUILD_NICE, SPECULATIVE_BUILD_JOBS)
+        worker.built.connect(lambda build: self.handle_speculative_built(worker, build))
+        worker.finished.connect(lambda: self.handle_speculative_finished(worker))
+        self.speculative = worker
+        worker.start()
+
+    def handle_speculative_built(self, worker, build):
+        self.store_build(build)
+        build["stored"] = True
+        if self.awaiting_speculative and self.awaiting_speculative[1] == build["cache_key"]:
+            self.resume_compile()
+
+    def handle_speculative_finished(self, worker):
+        if worker is self.speculative:
+            self.speculative = None
+        # Failed or cancelled: the normal compile reports any errors
+        self.resume_compile()
+
+    def resume_compile(self):
+        if not self.awaiting_speculative:
+            return
+        self.pending_build = self.awaiting_speculative[0]
+        self.awaiting_speculative = None
+        self.cancel_button.hide()
+        self.start_compile()
+
+    def save_buffer(self, source_path):
+        """Write the open editor for source_path to disk so the build sees the newest contents"""
+        tab_widget = self.parent.tab_manager.get_widget()
+        for i in range(tab_widget.count()):
+            if tab_widget.tabToolTip(i) == source_path:
+                try:
+                    with open(source_path, 'w') as f:
+                        f.write(tab_widget.widget(i).text())
+                except Exception as e:
+                    QMessageBox.critical(self.parent, "Error", f"Could not save file: {str(e)}")
+                    return False
+                break
+        return True
+
+    def get_pch_flag(self, source_path, compile_cmd):
+        if not COMPILE_USE_PCH:
+            return ""
+        try:
+            with open(source_path, 'r') as f:
+                if PCH_HEADER not in f.read():
+                    return ""
+        except Exception:
+            return ""
+        return self.pch_cache.include_flag(compile_cmd)
+
+    def update_progress(self):
+        if not self.is_compiling():
+            return
+        name = os.path.basename(self.current_build["source"])
+        queued = " (rebuild queued)" if self.pending_build else ""
+        self.status_label.setText(f"Compiling {name}... {self.elapsed.elapsed() / 1000:.1f}s{queued}")
+
+    def cancel(self):
+        if self.stress_tester:
+            self.stress_tester.cancel()
+        elif self.minimizer:
+            self.minimizer.cancel()
+        elif self.interactive_runner:
+            self.interactive_runner.cancel()
+        elif self.awaiting_speculative:
+            self.awaiting_speculative = None
+            self.cancel_button.hide()
+            self.status_label.setText("Compilation cancelled")
+        else:
+            self.cancel_compile()
+
+    def cancel_compile(self):
+        if not self.is_compiling():
+            return
+        self.cancelled = True
+        self.pending_build = None
+        pid = self.compile_process.processId()
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (OSError, AttributeError):
+            self.compile_process.kill()
+
+    def finish_compile(self):
+        process = self.compile_process
+        self.compile_process = None
+        self.progress_timer.stop()
+        self.cancel_button.hide()
+        process.deleteLater()
+        return process
+
+    def on_compile_error(self, error):
+        # Crashes and kills still emit finished; only a failed start ends here
+        if error != QProcess.ProcessError.FailedToStart or not self.is_compiling():
+            return
+        process = self.finish_compile()
+        self.status_label.setText("Compilation failed to start")
+        self.show_output(process.errorString())
+
+    def on_compile_output(self, process, final=False):
+        """Hand what the compiler printed so far to the diagnostics panel"""
+        if process is not self.compile_process:
+            return
+        build = self.current_build
+        text = build["decoder"].decode(process.readAllStandardError().data(), final)
+        build["stderr"].append(text)
+        panel = self.parent.io_manager.diagnostics_panel
+        first_error = panel.feed(text)
+        if final:
+            first_error = panel.finish() or first_error
+        if first_error and not self.parent.io_manager.io_widget.isVisible():
+            # The build has failed already, so show where before it ends
+            self.parent.io_manager.toggle_view()
+
+    def on_compile_finished(self, exit_code, exit_status):
+        if not self.is_compiling():
+            return
+        self.on_compile_output(self.compile_process, final=True)
+        self.finish_compile()
+        seconds = self.elapsed.elapsed() / 1000
+
+        if self.cancelled:
+            self.status_label.setText("Compilation cancelled")
+            return
+
+        if self.pending_build:
+            # The source changed while compiling; this result is already stale
+            self.start_compile()
+            return
+
+        build = self.current_build
+        source_path = build["source"]
+        executable = build["executable"]
+        diagnostics = "".join(build["stderr"])
+
+        if exit_status != QProcess.ExitStatus.NormalExit or exit_code != 0:
+            self.status_label.setText(f"Compilation failed ({seconds:.1f}s)")
+            self.show_output(diagnostics)
+            return
+
+        self.store_build(build, diagnostics)
+        self.status_label.setText(f"Compiled {os.path.basename(source_path)} ({seconds:.1f}s)")
+        self.run_executable(executable, build["working_dir"], source_path, build["run_tests"], build["fresh"])
+
+    def run_executable(self, executable, working_dir, source_path, run_tests=False, fresh=False):
+        if run_tests:
+            self.run_tests(executable, working_dir, source_path)
+        elif self.parent.io_manager.io_widget.isVisible():
+            self.run_with_io(executable, working_dir, fresh)
         else:
             self.run_in_terminal(executable, working_dir)
 
-    def run_with_io(self, executable, working_dir):
-        self.parent.io_manager.output_editor.clear()
+    def show_output(self, error):
+        # Write compilation error to output.txt instead of showing popup
+        io_manager = self.parent.io_manager
+        io_manager.output_editor.setText(error)
+        try:
+            with open(io_manager.output_path(create=True), 'w') as f:
+                f.write(error)
+            io_manager.mark_saved(io_manager.output_editor, io_manager.output_path())
+        except Exception as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not save output: {str(e)}")
+
+        # Make sure the IO widget is visible to show the error
+        if not self.parent.io_manager.io_widget.isVisible():
+            self.parent.io_manager.toggle_view()
+
+    def run_with_io(self, executable, working_dir, fresh=False):
+        io_manager = self.parent.io_manager
+        try:
+            output_path = io_manager.output_path(create=True)
+            input_path = io_manager.run_input_path(os.path.join(os.path.dirname(executable), "inputs"))
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not prepare input: {str(e)}")
+            return
+
+        # stderr is kept in a file too, so the run can be cached whole
+        stdout_sink = OutputSink(io_manager.output_editor, output_path, OUTPUT_FLUSH_RATE, OUTPUT_PANE_MAX_KB * 1024)
+        stderr_sink = OutputSink(io_manager.error_editor, executable + ".stderr", OUTPUT_FLUSH_RATE,
+                                 STDERR_PANE_MAX_KB * 1024, discard=io_manager.error_discard.isChecked(),
+                                 on_flush=io_manager.update_error_dropped)
+        limits = self.run_limits(RUN_TIME_LIMIT)
+        cache_key = self.run_cache.key(executable, input_path, limits)
+        cached = None if fresh else self.run_cache.lookup(cache_key, limits)
+        if cached and self.replay_run(cached, stdout_sink, stderr_sink):
+            return
+        try:
+            stdout_sink.open()
+            stderr_sink.open()
+            runner = ProgramRunner(executable, working_dir, input_path, stdout_sink, stderr_sink, limits)
+            runner.cache_key = cache_key
+            runner.finished.connect(lambda stats: self.handle_run_finished(stdout_sink, stderr_sink, stats, runner))
+            runner.start()
+            self.run_monitor.start(runner.process.pid, skip_root=bool(runner.limits.launcher))
+        except Exception as e:
+            self.handle_run_finished(stdout_sink, stderr_sink)
+            QMessageBox.critical(self.parent, "Error", f"Could not run program: {str(e)}")
+            return
+
+        self.process = runner
         
+    def run_tests(self, executable, working_dir, source_path):
         self.parent.io_manager.save_files()
-        
-        self.process = QProcess()
-        self.process.setWorkingDirectory(working_dir)
-        
-        self.process.setStandardInputFile(INPUT_PATH)
-        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
-        
-        self.process.readyReadStandardOutput.connect(
-            lambda: self.handle_output(self.process.readAllStandardOutput())
-        )
-        
-        self.process.start(executable)
-        
+        store = TestStore(source_path, TEST_COMPRESS_ABOVE_KB * 1024)
+        try:
+            tests = store.test_cases(os.path.join(os.path.dirname(executable), "inputs"))
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not prepare tests: {str(e)}")
+            return
+        if not tests:
+            QMessageBox.information(self.parent, "Tests", f"No test cases in {store.directory}")
+            return
+
+        if self.test_runner:
+            self.test_runner.cancel()
+
+        io_manager = self.parent.io_manager
+        if not io_manager.io_widget.isVisible():
+            io_manager.toggle_view()
+        io_manager.show_tests([test[0] for test in tests])
+
+        checker = find_partner(source_path, CHECKER_NAMES)
+        builds = []
+        if checker:
+            if not self.save_buffer(checker):
+                return
+            build = self.prepare_build(checker, "release")
+            checker = build["executable"]
+            if not build["cached"]:
+                builds.append(build)
+
+        output_dir = os.path.join(os.path.dirname(executable), "tests")
+        judge = Judge(self.tolerance(), checker)
+        runner = TestRunner(executable, working_dir, tests, output_dir, self.run_limits(TEST_TIME_LIMIT), judge, builds)
+        io_manager.test_outputs = {test[0]: runner.output_path(index) for index, test in enumerate(tests)}
+        runner.built.connect(self.store_build)
+        runner.build_failed.connect(lambda name, diagnostics: self.handle_build_failed(runner, name, diagnostics))
+        runner.test_finished.connect(io_manager.set_test_result)
+        runner.finished.connect(lambda: self.handle_tests_finished(runner))
+        self.test_runner = runner
+        self.status_label.setText(f"Running {len(tests)} tests...")
+        runner.start()
+
+    def handle_tests_finished(self, runner):
+        if runner is not self.test_runner:
+            return
+        self.test_runner = None
+        verdicts = self.parent.io_manager.test_verdicts()
+        passed = verdicts.count("AC") + verdicts.count("OK")
+        self.status_label.setText(f"Tests: {passed}/{len(verdicts)} passed")
+
+    def stress_test(self, source_path):
+        """Compare source_path against a brute force on generated inputs until they disagree"""
+        if not source_path or not source_path.endswith('.cpp'):
+            QMessageBox.warning(self.parent, "Warning", "Not a C++ file")
+            return
+        generator = find_partner(source_path, GENERATOR_NAMES)
+        brute = find_partner(source_path, BRUTE_NAMES)
+        if not generator or not brute:
+            stem = os.path.splitext(os.path.basename(source_path))[0]
+            QMessageBox.warning(self.parent, "Stress Test",
+                                f"Stress testing needs a generator ({stem}_gen.cpp, gen.cpp or gen.py) and a brute force "
+                                f"solution ({stem}_brute.cpp or brute.cpp) next to {os.path.basename(source_path)}")
+            return
+        if self.is_compiling():
+            self.status_label.setText("Wait for the current build to finish")
+            return
+        if self.stress_tester:
+            self.stress_tester.cancel()
+        if self.minimizer:
+            self.minimizer.cancel()
+
+        sources = [generator, brute, source_path]
+        for path in sources:
+            if not self.save_buffer(path):
+                return
+        self.stop_program()
+
+        if generator.endswith('.py'):
+            sources.remove(generator)
+        builds = [self.prepare_build(path, "release") for path in sources]
+        executables = [build["executable"] for build in builds]
+        if generator.endswith('.py'):
+            executables.insert(0, script_command(generator))
+        else:
+            executables[0] = [executables[0]]
+        tester = StressTester([build for build in builds if not build["cached"]], *executables,
+                              os.path.dirname(source_path), self.run_limits(TEST_TIME_LIMIT), STRESS_ITERATIONS,
+                              self.tolerance())
+        tester.built.connect(self.store_build)
+        tester.build_failed.connect(lambda name, diagnostics: self.handle_build_failed(tester, name, diagnostics))
+        tester.mismatch.connect(lambda *failure: self.handle_stress_mismatch(tester, *failure))
+        tester.finished.connect(lambda: self.handle_stress_finished(tester, source_path))
+        self.stress_tester = tester
+        self.cancel_button.show()
+        self.stress_timer.start()
+        self.update_stress_progress()
+        tester.start()
+
+    def update_stress_progress(self):
+        tester = self.stress_tester
+        if not tester:
+            return
+        if not tester.started_at:
+            self.status_label.setText("Stress: compiling...")
+            return
+        self.status_label.setText(f"Stress: {tester.completed}/{tester.iterations} passed, {tester.rate():.0f} it/s")
+
+    def handle_build_failed(self, worker, name, diagnostics):
+        if worker not in (self.stress_tester, self.minimizer, self.test_runner, self.interactive_runner):
+            return
+        if worker is self.test_runner:
+            self.test_runner = None
+        self.stress_timer.stop()
+        self.status_label.setText(f"{name} failed to compile")
+        self.show_output(diagnostics)
+
+    def handle_stress_mismatch(self, tester, seed, data, expected, actual, reason):
+        if tester is not self.stress_tester:
+            return
+        io_manager = self.parent.io_manager
+        self.stress_failure = data
+        self.show_output(actual.decode(errors='replace'))
+        try:
+            io_manager.add_test(data, expected)
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not save failing test: {str(e)}")
+        # Counted here, since workers still finishing their iteration may add to it
+        self.status_label.setText(f"Stress: {reason} on seed {seed} after {tester.completed} passed")
+        self.stress_timer.stop()
+
+    def handle_stress_finished(self, tester, source_path):
+        if tester is not self.stress_tester:
+            return
+        self.stress_tester = None
+        self.cancel_button.hide()
+        if self.stress_timer.isActive():
+            self.stress_timer.stop()
+            verb = "stopped" if tester.stopped else "done"
+            self.status_label.setText(f"Stress {verb}: {tester.completed} passed, {tester.rate():.0f} it/s")
+        elif tester.failed and self.stress_failure:
+            # The counterexample is saved as a test already; add its minimal form next to it
+            self.start_minimizer(source_path, self.stress_failure)
+        self.stress_failure = None
+
+    def minimize_test(self, source_path):
+        """Shrink the active test of source_path for as long as it still fails"""
+        if not source_path or not source_path.endswith('.cpp'):
+            QMessageBox.warning(self.parent, "Warning", "Not a C++ file")
+            return
+        io_manager = self.parent.io_manager
+        io_manager.save_files()
+        store = io_manager.store
+        test = store.active() if store else None
+        if not test or not test["input"]:
+            QMessageBox.information(self.parent, "Minimize Test", "There is no active test to minimize")
+            return
+        try:
+            with open_test_file(store.path(test["input"])) as f:
+                data = f.read()
+            expected = None
+            if test["expected"]:
+                with open_test_file(store.path(test["expected"])) as f:
+                    expected = f.read()
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not read test: {str(e)}")
+            return
+        self.start_minimizer(source_path, data, expected)
+
+    def start_minimizer(self, source_path, data, expected=None):
+        if self.is_compiling() or self.stress_tester:
+            self.status_label.setText("Wait for the current build to finish")
+            return
+        if self.minimizer:
+            self.minimizer.cancel()
+
+        brute = find_partner(source_path, BRUTE_NAMES)
+        sources = [source_path] + ([brute] if brute else [])
+        for path in sources:
+            if not self.save_buffer(path):
+                return
+        self.stop_program()
+
+        builds = [self.prepare_build(path, "release") for path in sources]
+        minimizer = TestMinimizer([build for build in builds if not build["cached"]], builds[0]["executable"],
+                                  builds[1]["executable"] if brute else None, os.path.dirname(source_path),
+                                  self.run_limits(TEST_TIME_LIMIT), data, expected, self.tolerance())
+        minimizer.built.connect(self.store_build)
+        minimizer.build_failed.connect(lambda name, diagnostics: self.handle_build_failed(minimizer, name, diagnostics))
+        minimizer.progress.connect(lambda size, probes: self.status_label.setText(
+            f"Minimizing: {len(data)} -> {size} bytes, {probes} probes"))
+        minimizer.finished.connect(lambda *result: self.handle_minimizer_finished(minimizer, *result))
+        self.minimizer = minimizer
+        self.cancel_button.show()
+        self.status_label.setText(f"Minimizing {len(data)} bytes...")
+        minimizer.start()
+
+    def handle_minimizer_finished(self, minimizer, data, expected, reason):
+        if minimizer is not self.minimizer:
+            return
+        self.minimizer = None
+        self.cancel_button.hide()
+        if data is None:
+            if reason:
+                self.status_label.setText(f"Could not minimize: {reason}")
+            return
+        try:
+            self.parent.io_manager.add_test(data, expected)
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not save minimized test: {str(e)}")
+            return
+        verb = "Minimization stopped at" if minimizer.stopped else "Minimized to"
+        self.status_label.setText(f"{verb} {len(data)} bytes ({reason}, {minimizer.probes} probes)")
+
+    def run_interactive(self, source_path):
+        """Run source_path against the interactor next to it on the active test"""
+        if not source_path or not source_path.endswith('.cpp'):
+            QMessageBox.warning(self.parent, "Warning", "Not a C++ file")
+            return
+        interactor = find_partner(source_path, INTERACTOR_NAMES)
+        if not interactor:
+            stem = os.path.splitext(os.path.basename(source_path))[0]
+            QMessageBox.warning(self.parent, "Interactive Run",
+                                f"Interactive runs need an interactor ({stem}_interactor.cpp or interactor.cpp) "
+                                f"next to {os.path.basename(source_path)}")
+            return
+        if self.is_compiling() or self.stress_tester or self.minimizer:
+            self.status_label.setText("Wait for the current build to finish")
+            return
+        if self.interactive_runner:
+            self.interactive_runner.cancel()
+
+        sources = [interactor, source_path]
+        for path in sources:
+            if not self.save_buffer(path):
+                return
+        self.stop_program()
+
+        builds = [self.prepare_build(path, "release") for path in sources]
+        executable = builds[1]["executable"]
+        io_manager = self.parent.io_manager
+        try:
+            input_path = io_manager.run_input_path(os.path.join(os.path.dirname(executable), "inputs"))
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not prepare input: {str(e)}")
+            return
+        runner = InteractiveRunner([build for build in builds if not build["cached"]], builds[0]["executable"],
+                                   executable, os.path.dirname(source_path), self.run_limits(TEST_TIME_LIMIT),
+                                   input_path, executable + ".tout", OUTPUT_PANE_MAX_KB * 1024)
+        runner.built.connect(self.store_build)
+        runner.build_failed.connect(lambda name, diagnostics: self.handle_build_failed(runner, name, diagnostics))
+        runner.finished.connect(lambda *result: self.handle_interactive_finished(runner, *result))
+        self.interactive_runner = runner
+        self.cancel_button.show()
+        self.status_label.setText("Interactive: running...")
+        runner.start()
+
+    def handle_interactive_finished(self, runner, verdict, message, solution, interactor):
+        if runner is not self.interactive_runner:
+            return
+        self.interactive_runner = None
+        self.cancel_button.hide()
+        if not verdict:
+            return
+        self.show_output(runner.transcript.text())
+        self.parent.io_manager.error_editor.setText(runner.errors.text())
+        status = f"Interactive: {verdict}"
+        if message:
+            status += f" ({message.splitlines()[0]})"
+        if solution and interactor:
+            status += f" · solution {solution.wall:.2f}s wall, {solution.cpu:.2f}s CPU · interactor {interactor.cpu:.2f}s CPU"
+        self.status_label.setText(status)
+
     def run_in_terminal(self, executable, working_dir):
         self.parent.terminal_handler.toggle_terminal(working_dir, f"{executable}")
         
-    def handle_output(self, data):
-        output = data.data().decode()
-        self.parent.io_manager.output_editor.setText(output)
+    def replay_run(self, cached, stdout_sink, stderr_sink):
+        """Show a cached run as if it had just happened; False if the cache can't be read"""
+        stats, stdout_path, stderr_path = cached
         try:
-            with open(OUTPUT_PATH, 'w') as f:
-                f.write(output)
-        except Exception as e:
-            QMessageBox.critical(self.parent, "Error", f"Could not save output: {str(e)}") 
\ No newline at end of file
+            stdout_sink.open()
+            stderr_sink.open()
+            for path, sink in ((stdout_path, stdout_sink), (stderr_path, stderr_sink)):
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        sink.write(chunk)
+        except OSError:
+            stdout_sink.close()
+            stderr_sink.close()
+            return False
+        self.process = None
+        self.handle_run_finished(stdout_sink, stderr_sink, stats)
+        return True
+
+    def handle_run_finished(self, stdout_sink, stderr_sink, stats=None, runner=None):
+        stdout_sink.close()
+        stderr_sink.close()
+        self.parent.io_manager.mark_saved(stdout_sink.editor, stdout_sink.path)
+        if stats and runner and not runner.killed:
+            self.run_cache.store(runner.cache_key, stats, stdout_sink.path, stderr_sink.path)
+        # A run replaced by a newer one still reports in, but the status bar belongs to the newer run
+        if runner is not self.process:
+            return
+        self.run_monitor.stop()
+        if stats:
+            self.status_label.setText(stats.summary())
@@ -0,0 +1,239 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTreeView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor
+from utils.properties import *
+from utils.compiler_output import OutputParser
+import os
+
+KIND_COLORS = {
+    "note": QColor("#5fb3b3"),
+    "context": QColor("#8a8a8a"),
+}
+# Longer messages are cut in the row and shown whole in the tooltip
+MAX_ROW_CHARS = 300
+
+class Node:
+    def __init__(self, parent, record=None, location=None):
+        self.parent = parent
+        self.record = record
+        # (path, line, column) of a group of records anchored at the same line
+        self.location = location
+        self.children = []
+        self.row = len(parent.children) if parent else 0
+
+    def target(self):
+        """(path, line, column) a click on this row jumps to"""
+        if self.record:
+            return self.record.path, self.record.line, self.record.column
+        return self.location
+
+class DiagnosticsModel(QAbstractItemModel):
+    """Compiler messages grouped by source line, with their notes and context under them"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = Node(None)
+        self.groups = {}
+        self.nodes = {}
+
+    def clear(self):
+        self.beginResetModel()
+        self.root = Node(None)
+        self.groups = {}
+        self.nodes = {}
+        self.endResetModel()
+
+    def append(self, parent, node):
+        # Rows are only ever appended, so the view keeps up with a build that is still printing
+        parent_index = QModelIndex() if parent is self.root else self.createIndex(parent.row, 0, parent)
+        self.beginInsertRows(parent_index, node.row, node.row)
+        parent.children.append(node)
+        self.endInsertRows()
+
+    def add_record(self, record):
+        path, line, _ = record.primary
+        key = (path, line)
+        group = self.groups.get(key)
+        if group is None:
+            group = Node(self.root, location=record.primary)
+            self.groups[key] = group
+            self.append(self.root, group)
+        else:
+            self.refresh(group)
+        node = Node(group, record)
+        self.nodes[id(record)] = node
+        self.append(group, node)
+        for entry in record.context + record.notes:
+            self.append(node, Node(node, entry))
+        return group
+
+    def add_note(self, record, note):
+        node = self.nodes[id(record)]
+        self.append(node, Node(node, note))
+
+    def refresh(self, node):
+        index = self.createIndex(node.row, 0, node)
+        self.dataChanged.emit(index, index)
+
+    def repeat(self, record):
+        self.refresh(self.nodes[id(record)])
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if column != 0 or row < 0 or row >= len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        record = node.record
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.text(node)[:MAX_ROW_CHARS]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return record.message if record else None
+        if role == Qt.ItemDataRole.ForegroundRole:
+            kind = record.kind if record else self.group_kind(node)
+            if kind == "error":
+                return EDITOR_ERROR_COLOR
+            if kind == "warning":
+                return EDITOR_WARNING_COLOR
+            return KIND_COLORS.get(kind)
+        return None
+
+    def group_kind(self, node):
+        return "error" if any(child.record.kind == "error" for child in node.children) else "warning"
+
+    def text(self, node):
+        record = node.record
+        if record is None:
+            path, line, _ = node.location
+            name = os.path.basename(path) if path else "(no file)"
+            where = f"{name}:{line}" if line else name
+            first = node.children[0].record if node.children else None
+            summary = f"{where}  {first.kind}: {first.message}" if first else where
+            if len(node.children) > 1:
+                summary += f"  (+{len(node.children) - 1} more)"
+            return summary
+        text = f"{record.kind}: {record.message}"
+        if node.parent is not self.root and node.parent.record is not None:
+            # Notes and context come from all over, so they carry their location
+            text = f"{record.location()}: {record.message}" if record.path else record.message
+        elif record.primary != (record.path, record.line, record.column) and record.path:
+            text = f"{record.location()}: {text}"
+        if record.count > 1:
+            text += f"  (x{record.count})"
+        return text
+
+class DiagnosticsPanel(QWidget):
+    """The messages of the last build, filled in while it is still compiling"""
+
+    jump_requested = pyqtSignal(str, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parser = None
+        self.errors = 0
+        self.warnings = 0
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        header = QHBoxLayout()
+        header.setContentsMargins(4, 2, 4, 2)
+        self.summary = QLabel()
+        self.summary.setStyleSheet("QLabel { color: #d8dee9; }")
+        header.addWidget(self.summary)
+        header.addStretch()
+        layout.addLayout(header)
+
+        self.model = DiagnosticsModel(self)
+        self.view = QTreeView()
+        self.view.setModel(self.model)
+        self.view.setHeaderHidden(True)
+        # Lets the view lay out only the rows on screen
+        self.view.setUniformRowHeights(True)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.view.setStyleSheet("""
+            QTreeView {
+                background-color: #1E1E1E;
+                color: #d8dee9;
+                border: none;
+            }
+        """)
+        self.view.clicked.connect(self.on_clicked)
+        layout.addWidget(self.view)
+        self.hide()
+
+    def start(self, source_path, working_dir):
+        """Clear the panel for a new build of source_path"""
+        self.parser = OutputParser(source_path, working_dir)
+        self.errors = 0
+        self.warnings = 0
+        self.model.clear()
+        self.update_summary()
+        self.hide()
+
+    def feed(self, text):
+        """Add what the build just printed; returns whether it brought the first error"""
+        if not self.parser:
+            return False
+        return self.apply(self.parser.feed(text))
+
+    def finish(self):
+        if not self.parser:
+            return False
+        first_error = self.apply(self.parser.finish())
+        self.parser = None
+        return first_error
+
+    def apply(self, events):
+        had_errors = self.errors > 0
+        for event in events:
+            if event[0] == "record":
+                record = event[1]
+                group = self.model.add_record(record)
+                if len(group.children) == 1:
+                    self.view.expand(self.model.createIndex(group.row, 0, group))
+                if record.kind == "error":
+                    self.errors += 1
+                else:
+                    self.warnings += 1
+            elif event[0] == "note":
+                self.model.add_note(event[1], event[2])
+            else:
+                self.model.repeat(event[1])
+        if events:
+            self.update_summary()
+            if self.model.groups:
+                self.show()
+        return not had_errors and self.errors > 0
+
+    def update_summary(self):
+        self.summary.setText(f"{self.errors} error(s), {self.warnings} warning(s)")
+
+    def on_clicked(self, index):
+        path, line, column = self.model.node(index).target()
+        if path and os.path.isfile(path):
+            self.jump_requested.emit(path, line, column)
@@ -0,0 +1,95 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QSplitter, QWidget
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from PyQt6.Qsci import QsciScintilla
+from editor.code_editor import CodeEditor
+from utils.comparator import compare_files
+from utils.properties import *
+from utils.test_store import open_test_file, uncompressed_size
+
+CONTEXT_LINES = 200
+MAX_LINE_BYTES = 4096
+DIFF_MARKER = 8
+
+def read_window(path, center, radius):
+    """(first line number, text) of the lines within radius of center, long lines cut short"""
+    first = max(1, center - radius)
+    lines = []
+    number = 0
+    with open_test_file(path) as f:
+        while number + 1 < center + radius:
+            line = f.readline(MAX_LINE_BYTES)
+            if not line:
+                break
+            number += 1
+            if len(line) == MAX_LINE_BYTES and not line.endswith(b"\n"):
+                rest = line
+                while rest and not rest.endswith(b"\n"):
+                    rest = f.readline(MAX_LINE_BYTES)
+                line += b" ...\n"
+            if number >= first:
+                lines.append(line)
+    return first, b"".join(lines).decode('utf-8', errors='replace')
+
+class DiffDialog(QDialog):
+    """Output and expected output side by side, scrolled together to where they first differ"""
+
+    def __init__(self, output_path, expected_path, tolerance=None, message="", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Output Diff")
+        self.difference = compare_files(output_path, expected_path, tolerance)
+        self.init_ui(output_path, expected_path, message)
+        self.resize(1000, 600)
+
+    def init_ui(self, output_path, expected_path, message):
+        layout = QVBoxLayout(self)
+        summary = str(self.difference) if self.difference else "Outputs match"
+        if message and message != summary:
+            summary = f"{summary}\n{message}"
+        self.summary = QLabel(summary)
+        self.summary.setWordWrap(True)
+        self.summary.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.summary)
+
+        difference = self.difference
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.editors = []
+        for title, path, line in (
+            ("Output", output_path, difference.actual_line if difference else None),
+            ("Expected", expected_path, difference.expected_line if difference else None),
+        ):
+            splitter.addWidget(self.create_side(title, path, line))
+        layout.addWidget(splitter, 1)
+
+        left, right = self.editors
+        left.verticalScrollBar().valueChanged.connect(right.verticalScrollBar().setValue)
+        right.verticalScrollBar().valueChanged.connect(left.verticalScrollBar().setValue)
+
+    def create_side(self, title, path, line):
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        label = QLabel(title)
+        layout.addWidget(label)
+
+        editor = CodeEditor()
+        editor.setReadOnly(True)
+        editor.setCaretLineVisible(False)
+        editor.markerDefine(QsciScintilla.MarkerSymbol.Background, DIFF_MARKER)
+        editor.setMarkerBackgroundColor(QColor("#5c2b2e"), DIFF_MARKER)
+        layout.addWidget(editor)
+        self.editors.append(editor)
+
+        if uncompressed_size(path) <= IO_EDITOR_MAX_KB * 1024:
+            with open_test_file(path) as f:
+                first, text = 1, f.read().decode('utf-8', errors='replace')
+        else:
+            # Only the lines around the difference are loaded from a large file
+            first, text = read_window(path, line or 1, CONTEXT_LINES)
+            label.setText(f"{title} (lines {first}-{first + text.count(chr(10)) - 1})")
+        editor.setText(text)
+        if line:
+            editor.markerAdd(line - first, DIFF_MARKER)
+            editor.setCursorPosition(line - first, 0)
+            editor.ensureLineVisible(line - first)
+        return widget
@@ -0,0 +1,105 @@
+from PyQt6.QtWidgets import (QDialog, QFormLayout, QComboBox, QSpinBox, QLineEdit,
+                             QCheckBox, QDialogButtonBox)
+from utils.testgen import TestGen, LOWERCASE, line, edges, render
+import random
+
+KINDS = ["Array", "Permutation", "Tree", "Connected Graph", "String"]
+
+class GenerateDialog(QDialog):
+    """Asks for the shape of a random test and builds it with testgen"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Generate Input")
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QFormLayout(self)
+
+        self.kind = QComboBox()
+        self.kind.addItems(KINDS)
+        self.kind.currentTextChanged.connect(self.update_fields)
+        layout.addRow("Kind:", self.kind)
+
+        self.size = QSpinBox()
+        self.size.setRange(1, 10 ** 7)
+        self.size.setValue(200000)
+        layout.addRow("Size N:", self.size)
+
+        self.edge_count = QSpinBox()
+        self.edge_count.setRange(0, 10 ** 7)
+        self.edge_count.setValue(400000)
+        layout.addRow("Edges M:", self.edge_count)
+
+        self.low = QSpinBox()
+        self.low.setRange(-2 ** 31, 2 ** 31 - 1)
+        self.low.setValue(1)
+        layout.addRow("Min Value:", self.low)
+
+        self.high = QSpinBox()
+        self.high.setRange(-2 ** 31, 2 ** 31 - 1)
+        self.high.setValue(10 ** 9)
+        layout.addRow("Max Value:", self.high)
+
+        self.alphabet = QLineEdit(LOWERCASE)
+        layout.addRow("Alphabet:", self.alphabet)
+
+        self.test_count = QSpinBox()
+        self.test_count.setRange(0, 10 ** 6)
+        self.test_count.setSpecialValueText("Single test")
+        layout.addRow("Test Cases T:", self.test_count)
+
+        self.with_sizes = QCheckBox("Print N (and M) before the data")
+        self.with_sizes.setChecked(True)
+        layout.addRow("", self.with_sizes)
+
+        self.seed = QSpinBox()
+        self.seed.setRange(0, 2 ** 31 - 1)
+        self.seed.setValue(random.randrange(2 ** 31))
+        layout.addRow("Seed:", self.seed)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+        self.form = layout
+        self.update_fields(self.kind.currentText())
+
+    def update_fields(self, kind):
+        shown = {
+            self.edge_count: kind == "Connected Graph",
+            self.low: kind == "Array",
+            self.high: kind == "Array",
+            self.alphabet: kind == "String",
+        }
+        for field, visible in shown.items():
+            self.form.setRowVisible(field, visible)
+
+    def case(self, gen):
+        kind = self.kind.currentText()
+        n = self.size.value()
+        header = [n]
+        if kind == "Array":
+            data = line(gen.array(n, self.low.value(), self.high.value()))
+        elif kind == "Permutation":
+            data = line(gen.permutation(n))
+        elif kind == "Tree":
+            data = edges(gen.tree(n))
+        elif kind == "Connected Graph":
+            m = self.edge_count.value()
+            header.append(m)
+            data = edges(gen.graph(n, m))
+        else:
+            data = gen.string(n, self.alphabet.text() or LOWERCASE)
+        parts = [line(header)] if self.with_sizes.isChecked() else []
+        if data:
+            parts.append(data)
+        return "\n".join(parts)
+
+    def generate(self):
+        """The input described by the dialog; raises ValueError for impossible graphs or ranges"""
+        gen = TestGen(self.seed.value())
+        if self.test_count.value():
+            return render(gen.tests(self.test_count.value(), self.case)).encode()
+        return render(self.case(gen)).encode()
@@ -1,12 +1,44 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QSplitter, QMessageBox
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QMessageBox,
+                             QToolButton, QLabel, QCheckBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QPushButton)
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
 from editor.code_editor import CodeEditor
+from .generate_dialog import GenerateDialog
+from .diff_dialog import DiffDialog
+from .diagnostics_panel import DiagnosticsPanel
 from utils.properties import *
+from utils.test_store import TestStore, open_test_file, uncompressed_size
+from utils.comparator import Tolerance
 import os
 
+TEST_VERDICT_COLORS = {
+    "AC": "#99c794",
+    "OK": "#99c794",
+    "WA": "#ec5f67",
+    "RE": "#f99157",
+    "TLE": "#fac863",
+    "MLE": "#c594c5",
+    "FAIL": "#5fb3b3",
+}
+
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
 class IOManager:
     def __init__(self, parent=None):
         self.parent = parent
+        self.source_path = None
+        self.store = None
+        # editor -> (path, stamp) of what it shows, so unchanged files are not re-read
+        self.loaded = {}
+        self.banners = {}
+        # test name -> where the last test run wrote its output
+        self.test_outputs = {}
         self.setup_io_widget()
         
     def setup_io_widget(self):
@@ -21,15 +53,265 @@ class IOManager:
         self.input_editor = CodeEditor()
         self.input_editor.setWindowTitle(INPUT_FILE)
         self.input_editor.set_file_path(INPUT_PATH)
-        self.io_splitter.addWidget(self.input_editor)
+        self.io_splitter.addWidget(self.with_banner(self.input_editor))
 
         self.output_editor = CodeEditor()
         self.output_editor.setWindowTitle(OUTPUT_FILE)
         self.output_editor.set_file_path(OUTPUT_PATH)
-        self.io_splitter.addWidget(self.output_editor)
+        self.io_splitter.addWidget(self.with_banner(self.output_editor))
+
+        self.setup_error_pane()
+        self.setup_tests_table()
+        self.setup_diagnostics_panel()
 
         self.io_widget.hide()
 
+    def with_banner(self, editor):
+        """Wrap editor with a bar offering to load files too large to show by default"""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        banner = QWidget()
+        banner_layout = QHBoxLayout(banner)
+        banner_layout.setContentsMargins(4, 2, 4, 2)
+        label = QLabel()
+        label.setStyleSheet("QLabel { color: #d8dee9; }")
+        banner_layout.addWidget(label)
+        banner_layout.addStretch()
+        load_button = QPushButton("Load")
+        load_button.clicked.connect(lambda: self.load_editor(editor, self.loaded[editor][0], force=True))
+        banner_layout.addWidget(load_button)
+        banner.hide()
+
+        layout.addWidget(banner)
+        layout.addWidget(editor)
+        self.banners[editor] = (banner, label)
+        return container
+
+    def setup_tests_table(self):
+        """The active source's test cases, with verdicts from the last test run"""
+        self.tests_widget = QWidget()
+        tests_layout = QVBoxLayout(self.tests_widget)
+        tests_layout.setContentsMargins(0, 0, 0, 0)
+        tests_layout.setSpacing(0)
+
+        buttons = QHBoxLayout()
+        buttons.setContentsMargins(4, 2, 4, 2)
+        for text, slot in (("New Test", self.new_test), ("Generate", self.generate_test),
+                           ("Delete Test", self.delete_test), ("Set Expected", self.set_expected),
+                           ("Diff", self.show_diff)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        buttons.addStretch()
+        tests_layout.addLayout(buttons)
+
+        self.tests_table = QTableWidget(0, 3)
+        self.tests_table.setHorizontalHeaderLabels(["Test", "Verdict", "Time"])
+        self.tests_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tests_table.verticalHeader().hide()
+        self.tests_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tests_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tests_table.setStyleSheet("""
+            QTableWidget {
+                background-color: #1E1E1E;
+                color: #d8dee9;
+                gridline-color: #333333;
+                border: none;
+            }
+            QHeaderView::section {
+                background-color: #2D2D2D;
+                color: #CCCCCC;
+                border: none;
+                padding: 2px;
+            }
+        """)
+        self.tests_table.cellClicked.connect(self.select_test)
+        tests_layout.addWidget(self.tests_table)
+
+        self.tests_widget.hide()
+        self.io_splitter.insertWidget(0, self.tests_widget)
+
+    def setup_diagnostics_panel(self):
+        """Compiler messages of the last build, above everything else while there are any"""
+        self.diagnostics_panel = DiagnosticsPanel()
+        # The tab manager is created after this one
+        self.diagnostics_panel.jump_requested.connect(lambda path, line, column: self.parent.tab_manager.go_to(path, line, column))
+        self.io_splitter.insertWidget(0, self.diagnostics_panel)
+
+    def refresh_tests(self):
+        if not self.store:
+            self.tests_widget.hide()
+            return
+        self.show_tests([test["name"] for test in self.store.tests()], "")
+
+    def show_tests(self, names, verdict="..."):
+        self.tests_table.setRowCount(len(names))
+        active = self.store.active() if self.store else None
+        for row, name in enumerate(names):
+            self.tests_table.setItem(row, 0, QTableWidgetItem(name))
+            self.tests_table.setItem(row, 1, QTableWidgetItem(verdict))
+            self.tests_table.setItem(row, 2, QTableWidgetItem(""))
+            if active and active["name"] == name:
+                self.tests_table.selectRow(row)
+        self.tests_widget.show()
+
+    def select_test(self, row, column):
+        name = self.tests_table.item(row, 0).text()
+        self.save_files()
+        self.store.set_active(name)
+        self.load_editor(self.input_editor, self.input_path())
+
+    def new_test(self):
+        if not self.store:
+            return
+        self.save_files()
+        self.store.add_test()
+        self.refresh_tests()
+        self.load_editor(self.input_editor, self.input_path())
+
+    def add_test(self, input_data, expected_data=None):
+        """Store a new test, such as a stress test counterexample, and make it active"""
+        if not self.store:
+            return
+        self.save_files()
+        self.store.add_test(input_data, expected_data)
+        self.refresh_tests()
+        self.load_editor(self.input_editor, self.input_path())
+
+    def generate_test(self):
+        """Add a random test of a chosen shape and size"""
+        if not self.store:
+            return
+        dialog = GenerateDialog(self.parent)
+        if dialog.exec() != GenerateDialog.DialogCode.Accepted:
+            return
+        try:
+            data = dialog.generate()
+        except ValueError as e:
+            QMessageBox.warning(self.parent, "Generate Input", str(e))
+            return
+        self.add_test(data)
+
+    def delete_test(self):
+        test = self.store.active() if self.store else None
+        if not test:
+            return
+        answer = QMessageBox.question(self.parent, "Delete Test", f"Delete test {test['name']}?")
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        self.store.remove_test(test["name"])
+        self.refresh_tests()
+        self.load_editor(self.input_editor, self.input_path())
+
+    def set_expected(self):
+        """Save the last output as the active test's expected output"""
+        if not self.store:
+            return
+        try:
+            self.save_files()
+            # The file, not the pane, which may be cut short or not loaded at all
+            output_path = self.output_path()
+            data = b""
+            if os.path.exists(output_path):
+                with open_test_file(output_path) as f:
+                    data = f.read()
+            test = self.store.active() or self.store.add_test()
+            self.store.write(test, "expected", data)
+        except Exception as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not save expected output: {str(e)}")
+        self.refresh_tests()
+
+    def set_test_result(self, row, verdict, seconds, message=""):
+        item = QTableWidgetItem(verdict)
+        item.setForeground(QColor(TEST_VERDICT_COLORS.get(verdict, "#d8dee9")))
+        item.setToolTip(message)
+        self.tests_table.setItem(row, 1, item)
+        self.tests_table.setItem(row, 2, QTableWidgetItem(f"{seconds * 1000:.0f} ms"))
+
+    def show_diff(self):
+        """Compare the active test's expected output with its newest output"""
+        test = self.store.active() if self.store else None
+        if not test or not test["expected"]:
+            QMessageBox.information(self.parent, "Diff", "The active test has no expected output")
+            return
+        self.save_files()
+        candidates = [path for path in (self.test_outputs.get(test["name"]), self.output_path())
+                      if path and os.path.exists(path)]
+        if not candidates:
+            QMessageBox.information(self.parent, "Diff", "Run the program first")
+            return
+        output = max(candidates, key=os.path.getmtime)
+        message = ""
+        for row in range(self.tests_table.rowCount()):
+            if self.tests_table.item(row, 0).text() == test["name"] and self.tests_table.item(row, 1):
+                message = self.tests_table.item(row, 1).toolTip()
+        tolerance = Tolerance(COMPARE_ABS_TOLERANCE, COMPARE_REL_TOLERANCE)
+        try:
+            DiffDialog(output, self.store.path(test["expected"]), tolerance, message, self.parent).exec()
+        except OSError as e:
+            QMessageBox.critical(self.parent, "Error", f"Could not compare outputs: {str(e)}")
+
+    def test_verdicts(self):
+        return [self.tests_table.item(row, 1).text() for row in range(self.tests_table.rowCount())]
+
+    def setup_error_pane(self):
+        """Collapsible pane for the program's stderr, kept out of output.txt"""
+        self.error_widget = QWidget()
+        error_layout = QVBoxLayout(self.error_widget)
+        error_layout.setContentsMargins(0, 0, 0, 0)
+        error_layout.setSpacing(0)
+
+        header = QHBoxLayout()
+        header.setContentsMargins(4, 2, 4, 2)
+        self.error_toggle = QToolButton()
+        self.error_toggle.setText("stderr")
+        self.error_toggle.setCheckable(True)
+        self.error_toggle.setChecked(True)
+        self.error_toggle.setArrowType(Qt.ArrowType.DownArrow)
+        self.error_toggle.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.error_toggle.setAutoRaise(True)
+        self.error_toggle.toggled.connect(self.toggle_error_pane)
+        header.addWidget(self.error_toggle)
+
+        self.error_dropped_label = QLabel()
+        self.error_dropped_label.setStyleSheet("QLabel { color: #d8dee9; }")
+        header.addWidget(self.error_dropped_label)
+        header.addStretch()
+
+        self.error_discard = QCheckBox("Discard")
+        self.error_discard.setStyleSheet("QCheckBox { color: #d8dee9; }")
+        self.error_discard.setChecked(STDERR_DISCARD)
+        header.addWidget(self.error_discard)
+        error_layout.addLayout(header)
+
+        self.error_editor = CodeEditor()
+        self.error_editor.setReadOnly(True)
+        error_layout.addWidget(self.error_editor)
+
+        self.io_splitter.addWidget(self.error_widget)
+
+    def toggle_error_pane(self, expanded):
+        self.error_editor.setVisible(expanded)
+        self.error_toggle.setArrowType(Qt.ArrowType.DownArrow if expanded else Qt.ArrowType.RightArrow)
+        if not expanded:
+            # Give the freed space back to the input and output panes
+            sizes = self.io_splitter.sizes()
+            error = self.io_splitter.indexOf(self.error_widget)
+            output = self.io_splitter.indexOf(self.output_editor.parentWidget())
+            header = self.error_widget.minimumSizeHint().height()
+            sizes[output] += sizes[error] - header
+            sizes[error] = header
+            self.io_splitter.setSizes(sizes)
+
+    def update_error_dropped(self, sink):
+        if sink.dropped:
+            self.error_dropped_label.setText(f"{sink.dropped:,} bytes dropped")
+        else:
+            self.error_dropped_label.clear()
+
     def toggle_view(self):
         if self.io_widget.isVisible():
             self.io_widget.hide()
@@ -37,27 +319,95 @@ class IOManager:
             self.io_widget.show()
             self.load_files()
 
+    def set_source(self, source_path):
+        """Follow the active tab: each C++ source keeps its own tests and input"""
+        if source_path == self.source_path:
+            return
+        self.save_files()
+        self.source_path = source_path
+        self.test_outputs = {}
+        if source_path and source_path.endswith('.cpp'):
+            self.store = TestStore(source_path, TEST_COMPRESS_ABOVE_KB * 1024)
+        else:
+            self.store = None
+        if self.io_widget.isVisible():
+            self.refresh_tests()
+            self.load_files()
+
+    def input_path(self):
+        if not self.store:
+            return INPUT_PATH
+        test = self.store.active()
+        return self.store.path(test["input"]) if test else None
+
+    def output_path(self, create=False):
+        return self.store.output_path(create) if self.store else OUTPUT_PATH
+
+    def run_input_path(self, cache_dir):
+        """Saved input for the next run, decompressed if the active test is stored gzipped"""
+        self.save_files()
+        if not self.store:
+            return INPUT_PATH
+        test = self.store.active()
+        if not test or not test["input"]:
+            return os.devnull
+        return self.store.plain_path(test["input"], cache_dir)
+
     def load_files(self):
         try:
-            if os.path.exists(INPUT_PATH):
-                with open(INPUT_PATH, 'r') as f:
-                    self.input_editor.setText(f.read())
-                self.input_editor.set_file_path(INPUT_PATH)
-            
-            if os.path.exists(OUTPUT_PATH):
-                with open(OUTPUT_PATH, 'r') as f:
-                    self.output_editor.setText(f.read())
-                self.output_editor.set_file_path(OUTPUT_PATH)
+            self.refresh_tests()
+            self.load_editor(self.input_editor, self.input_path())
+            self.load_editor(self.output_editor, self.output_path())
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"Could not load I/O files: {str(e)}")
 
+    def load_editor(self, editor, path, force=False):
+        stamp = file_stamp(path)
+        if not force and self.loaded.get(editor) == (path, stamp):
+            return
+        banner, label = self.banners[editor]
+        banner.hide()
+        editor.setReadOnly(False)
+
+        if stamp is None:
+            editor.setText("")
+        elif not force and (path.endswith(".gz") or stamp[1] > IO_EDITOR_MAX_KB * 1024):
+            # Large tests stay on disk unless asked for
+            size = uncompressed_size(path)
+            label.setText(f"{os.path.basename(path)} ({size / (1024 * 1024):.1f} MB) is not loaded")
+            banner.show()
+            editor.setText("")
+            editor.setReadOnly(True)
+        else:
+            with open_test_file(path) as f:
+                editor.setText(f.read().decode('utf-8', errors='replace'))
+        editor.setModified(False)
+        self.loaded[editor] = (path, stamp)
+
+    def mark_saved(self, editor, path):
+        """Record that path on disk already matches what editor shows"""
+        editor.setModified(False)
+        self.loaded[editor] = (path, file_stamp(path))
+
     def save_files(self):
         try:
-            with open(INPUT_PATH, 'w') as f:
-                f.write(self.input_editor.text())
-            
-            with open(OUTPUT_PATH, 'w') as f:
-                f.write(self.output_editor.text())
+            if self.input_editor.isModified():
+                data = self.input_editor.text().encode()
+                if self.store:
+                    test = self.store.active()
+                    if not test:
+                        test = self.store.add_test()
+                        self.refresh_tests()
+                    self.store.write(test, "input", data)
+                else:
+                    with open(INPUT_PATH, 'wb') as f:
+                        f.write(data)
+                self.mark_saved(self.input_editor, self.input_path())
+
+            if self.output_editor.isModified():
+                with open(self.output_path(create=True), 'w') as f:
+                    f.write(self.output_editor.text())
+                self.mark_saved(self.output_editor, self.output_path())
         except Exception as e:
             QMessageBox.critical(self.parent, "Error", f"Could not save I/O files: {str(e)}")
 
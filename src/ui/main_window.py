@@ -37,6 +37,15 @@ class MainWindow(QMainWindow):
         self.file_browser_manager = FileBrowserManager(self)
         
         self.file_browser_manager.connect_file_selected(self.tab_manager.open_file)
+        self.tab_manager.get_widget().currentChanged.connect(self.on_tab_changed)
+
+    def on_tab_changed(self, index):
+        # The editor's own path: the tab tooltip is not set yet when addTab makes a tab current
+        editor = self.tab_manager.get_current_editor()
+        self.io_manager.set_source(editor.file_path if editor else None)
+        if editor:
+            self.compiler_manager.syntax_checker.attach(editor)
+        self.compiler_manager.syntax_checker.schedule(editor)
 
     def init_ui(self):
         # Explicitly set the window title from properties
@@ -121,6 +130,8 @@ class MainWindow(QMainWindow):
                 font-family: Consolas;
             }
         """)
+        self.status_bar.addWidget(self.compiler_manager.get_status_widget())
+        self.status_bar.addPermanentWidget(self.compiler_manager.get_monitor_widget())
         self.status_bar.addPermanentWidget(self.clock_label)
         
         # Update clock every second
@@ -164,7 +175,7 @@ class MainWindow(QMainWindow):
                 self.compiler_manager.compile_and_run(self.tab_manager.get_current_file(), debug=False)
                 return True
             # F9 to compile with debug flags and run
-            elif event.key() == Qt.Key.Key_F9:
+            elif event.key() == Qt.Key.Key_F9 and event.modifiers() == Qt.KeyboardModifier.NoModifier:
                 self.compiler_manager.compile_and_run(self.tab_manager.get_current_file(), debug=True)
                 return True
             # F3 to cycle between editors
@@ -205,4 +216,6 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.io_manager.save_files()
+        self.compiler_manager.syntax_checker.shutdown()
+        self.compiler_manager.pch_cache.shutdown()
         super().closeEvent(event)
\ No newline at end of file
@@ -36,7 +36,13 @@ class MenuBar(QMenuBar):
 
         build_menu = self.addMenu("&Build")
         build_menu.addAction("Compile and Run", self.compile_and_run).setShortcut(SHORTCUT_COMPILE_RUN)
+        build_menu.addAction("Compile and Run Fresh", self.compile_and_run_fresh).setShortcut(SHORTCUT_COMPILE_RUN_FRESH)
         build_menu.addAction("Compile and Debug", self.compile_and_debug).setShortcut(SHORTCUT_COMPILE_DEBUG)
+        build_menu.addAction("Run Tests", self.run_tests).setShortcut(SHORTCUT_RUN_TESTS)
+        build_menu.addAction("Stress Test", self.stress_test).setShortcut(SHORTCUT_STRESS_TEST)
+        build_menu.addAction("Minimize Test", self.minimize_test).setShortcut(SHORTCUT_MINIMIZE_TEST)
+        build_menu.addAction("Run Interactive", self.run_interactive).setShortcut(SHORTCUT_RUN_INTERACTIVE)
+        build_menu.addAction("Cancel Compile", self.cancel_compile).setShortcut(SHORTCUT_CANCEL_COMPILE)
 
     def new_file(self):
         new_editor = CodeEditor()
@@ -79,6 +85,7 @@ class MenuBar(QMenuBar):
                 current_index = self.parent().tab_manager.get_widget().currentIndex()
                 self.parent().tab_manager.get_widget().setTabText(current_index, os.path.basename(file_name))
                 self.parent().tab_manager.get_widget().setTabToolTip(current_index, file_name)
+                self.parent().io_manager.set_source(file_name)
 
     def _save_to_file(self, file_name):
         current_editor = self.parent().tab_manager.get_current_editor()
@@ -87,6 +94,8 @@ class MenuBar(QMenuBar):
                 file.write(current_editor.text())
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not save file: {str(e)}")
+            return
+        self.parent().compiler_manager.speculative_build(file_name)
 
     def close_current_tab(self):
         current_index = self.parent().tab_manager.get_widget().currentIndex()
@@ -107,12 +116,36 @@ class MenuBar(QMenuBar):
             debug=False
         )
 
+    def compile_and_run_fresh(self):
+        self.parent().compiler_manager.compile_and_run(
+            self.parent().tab_manager.get_current_file(),
+            fresh=True
+        )
+
     def compile_and_debug(self):
         self.parent().compiler_manager.compile_and_run(
             self.parent().tab_manager.get_current_file(), 
             debug=True
         )
 
+    def run_tests(self):
+        self.parent().compiler_manager.compile_and_run(
+            self.parent().tab_manager.get_current_file(),
+            run_tests=True
+        )
+
+    def stress_test(self):
+        self.parent().compiler_manager.stress_test(self.parent().tab_manager.get_current_file())
+
+    def minimize_test(self):
+        self.parent().compiler_manager.minimize_test(self.parent().tab_manager.get_current_file())
+
+    def run_interactive(self):
+        self.parent().compiler_manager.run_interactive(self.parent().tab_manager.get_current_file())
+
+    def cancel_compile(self):
+        self.parent().compiler_manager.cancel()
+
     def undo(self):
         current_editor = self.parent().tab_manager.get_current_editor()
         if current_editor:
@@ -0,0 +1,83 @@
+from PyQt6.QtCore import QTimer
+import codecs
+import threading
+
+class OutputSink:
+    """Streams a running program's output to a file in full and to a pane in batches, up to pane_limit bytes"""
+
+    def __init__(self, editor, path=None, rate=30, pane_limit=4 * 1024 * 1024, discard=False, on_flush=None):
+        self.editor = editor
+        self.path = path
+        self.pane_limit = pane_limit
+        self.discard = discard
+        self.on_flush = on_flush
+        self.file = None
+        self.closed = True
+        self.lock = threading.Lock()
+        self.pending = []
+        self.queued = 0
+        self.dropped = 0
+        self.truncated = False
+        self.capped = False
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.timer = QTimer()
+        self.timer.setInterval(max(1000 // rate, 1))
+        self.timer.timeout.connect(self.flush)
+
+    def open(self):
+        self.editor.clear()
+        self.editor.setModified(False)
+        if self.path:
+            self.file = open(self.path, 'wb')
+        self.closed = False
+        self.timer.start()
+
+    def write(self, data):
+        # Called from reader threads; the pane is only touched by flush()
+        if self.closed:
+            return
+        if self.file:
+            self.file.write(data)
+        with self.lock:
+            # Capped while still off the GUI thread so a flood never piles up in memory
+            room = 0 if self.discard else max(self.pane_limit - self.queued, 0)
+            if len(data) > room:
+                self.dropped += len(data) - room
+                if not self.discard and not self.capped:
+                    self.capped = self.truncated = True
+                data = data[:room]
+            if data:
+                self.pending.append(data)
+                self.queued += len(data)
+
+    def flush(self):
+        with self.lock:
+            data = b"".join(self.pending)
+            self.pending = []
+            truncated = self.truncated
+            self.truncated = False
+
+        text = self.decoder.decode(data, final=truncated)
+        if truncated:
+            where = f", the full output is in {self.path}" if self.path else ""
+            text += f"\n... output truncated here{where}\n"
+        if text:
+            self.editor.append(text)
+            # Only edits by the user are saved back over the output file
+            self.editor.setModified(False)
+        if self.on_flush:
+            self.on_flush(self)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.timer.stop()
+        self.flush()
+        tail = self.decoder.decode(b"", final=True)
+        if tail:
+            self.editor.append(tail)
+            self.editor.setModified(False)
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,106 @@
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
+from PyQt6.QtCore import QTimer, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from utils.proc_sampler import ProcSampler
+from collections import deque
+
+SAMPLE_INTERVAL = 100
+HISTORY = 120
+CPU_COLOR = "#99c794"
+RSS_COLOR = "#6699cc"
+
+class Sparkline(QWidget):
+    """CPU and RSS history drawn as two lines, newest on the right"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cpu = deque(maxlen=HISTORY)
+        self.rss = deque(maxlen=HISTORY)
+        self.setFixedSize(HISTORY, 16)
+
+    def clear(self):
+        self.cpu.clear()
+        self.rss.clear()
+        self.update()
+
+    def add(self, cpu, rss):
+        self.cpu.append(cpu)
+        self.rss.append(rss)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # CPU is drawn against 100% so a busy loop sits at the top; RSS against its own peak
+        cpu_scale = max(100.0, max(self.cpu, default=0))
+        rss_scale = max(self.rss, default=0) or 1
+        for values, scale, color in ((self.rss, rss_scale, RSS_COLOR), (self.cpu, cpu_scale, CPU_COLOR)):
+            if len(values) < 2:
+                continue
+            offset = self.width() - len(values)
+            height = self.height() - 2
+            points = QPolygonF([QPointF(offset + i, 1 + height * (1 - value / scale))
+                                for i, value in enumerate(values)])
+            painter.setPen(QPen(QColor(color), 1))
+            painter.drawPolyline(points)
+        painter.end()
+
+class RunMonitor(QWidget):
+    """Live CPU and memory readout of the running program, with a kill button"""
+
+    def __init__(self, on_kill, parent=None):
+        super().__init__(parent)
+        self.sampler = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(SAMPLE_INTERVAL)
+        self.timer.timeout.connect(self.update_sample)
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.sparkline = Sparkline()
+        layout.addWidget(self.sparkline)
+
+        self.label = QLabel()
+        self.label.setStyleSheet("QLabel { color: #d8dee9; padding: 2px 0px; font-family: Consolas; }")
+        layout.addWidget(self.label)
+
+        self.kill_button = QPushButton("Kill")
+        self.kill_button.setFlat(True)
+        self.kill_button.setToolTip("Kill the running program")
+        self.kill_button.setStyleSheet("""
+            QPushButton {
+                color: #d8dee9;
+                padding: 0px 6px;
+                border: 1px solid #555555;
+            }
+            QPushButton:hover {
+                background-color: #AA0000;
+            }
+        """)
+        self.kill_button.clicked.connect(on_kill)
+        layout.addWidget(self.kill_button)
+        self.hide()
+
+    def start(self, pid, skip_root=False):
+        self.sampler = ProcSampler(pid, skip_root)
+        self.sparkline.clear()
+        self.label.setText(f"<span style='color:{CPU_COLOR}'>CPU --</span> "
+                           f"<span style='color:{RSS_COLOR}'>RSS --</span>")
+        self.timer.start()
+        self.show()
+
+    def stop(self):
+        self.timer.stop()
+        self.sampler = None
+        self.hide()
+
+    def update_sample(self):
+        sample = self.sampler.sample() if self.sampler else None
+        if sample is None:
+            return
+        cpu, rss = sample
+        self.sparkline.add(cpu, rss)
+        self.label.setText(f"<span style='color:{CPU_COLOR}'>CPU {cpu:3.0f}%</span> "
+                           f"<span style='color:{RSS_COLOR}'>RSS {rss / (1024 * 1024):.1f} MB</span>")
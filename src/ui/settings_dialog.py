@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, 
                              QWidget, QLabel, QSpinBox, QComboBox, QPushButton,
                              QColorDialog, QFontComboBox, QCheckBox, QScrollArea, QMessageBox,
-                             QLineEdit, QGroupBox, QFormLayout, QSizePolicy, QSpacerItem)
+                             QLineEdit, QGroupBox, QFormLayout, QSizePolicy, QSpacerItem, QDoubleSpinBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor, QKeySequence
 from editor.custom_lexer import LexerCPP
@@ -27,6 +27,8 @@ DEFAULT_SETTINGS = {
     "EDITOR_BRACE_MATCHED_FG_COLOR": "#00FF00",
     "EDITOR_BRACE_UNMATCHED_BG_COLOR": "#802020",
     "EDITOR_BRACE_UNMATCHED_FG_COLOR": "#FF0000",
+    "EDITOR_ERROR_COLOR": "#FF5555",
+    "EDITOR_WARNING_COLOR": "#E5C07B",
     "SYNTAX_DEFAULT": "#d7d7d7",
     "SYNTAX_COMMENT": "#FFFF7F",
     "SYNTAX_DOUBLE_SLASH_COMMENT": "#37743f",
@@ -47,6 +49,30 @@ DEFAULT_SETTINGS = {
     # Additional settings that were previously only in properties.py
     "COMPILE_RELEASE_CMD": 'g++ -DLOCAL -std=c++17 -Wshadow -Wall -o "{executable}" "{source}" -O2 -Wno-unused-result',
     "COMPILE_DEBUG_CMD": 'g++ -DLOCAL -std=c++17 -Wshadow -Wall -o "{executable}" "{source}" -g -D_GLIBCXX_DEBUG',
+    "COMPILE_USE_PCH": True,
+    "COMPILE_CACHE_MAX_MB": 512,
+    "RUN_CACHE_MAX_MB": 256,
+    "SPECULATIVE_BUILD": False,
+    "SPECULATIVE_BUILD_DEBUG": False,
+    "SPECULATIVE_BUILD_NICE": 10,
+    "SPECULATIVE_BUILD_JOBS": 1,
+    "IDLE_CHECK": True,
+    "IDLE_CHECK_DELAY_MS": 400,
+    "ARTIFACT_MAX_MB": 256,
+    "ARTIFACTS_IN_RAM": False,
+    "OUTPUT_FLUSH_RATE": 30,
+    "OUTPUT_PANE_MAX_KB": 4096,
+    "STDERR_PANE_MAX_KB": 256,
+    "STDERR_DISCARD": False,
+    "TEST_TIME_LIMIT": 2.0,
+    "RUN_TIME_LIMIT": 10.0,
+    "RUN_MEMORY_LIMIT_MB": 1024,
+    "RUN_STACK_MB": 0,
+    "STRESS_ITERATIONS": 10000,
+    "COMPARE_ABS_TOLERANCE": 0.0,
+    "COMPARE_REL_TOLERANCE": 0.0,
+    "TEST_COMPRESS_ABOVE_KB": 1024,
+    "IO_EDITOR_MAX_KB": 1024,
     "SHORTCUT_NEW_FILE": "Ctrl+N",
     "SHORTCUT_OPEN_FILE": "Ctrl+O",
     "SHORTCUT_SAVE_FILE": "Ctrl+S",
@@ -58,7 +84,13 @@ DEFAULT_SETTINGS = {
     "SHORTCUT_TOGGLE_TERMINAL": "Ctrl+`",
     "SHORTCUT_SNIPPET_PICKER": "Ctrl+J",
     "SHORTCUT_COMPILE_RUN": "Ctrl+Alt+N",
+    "SHORTCUT_COMPILE_RUN_FRESH": "Ctrl+Alt+Shift+N",
     "SHORTCUT_COMPILE_DEBUG": "F9",
+    "SHORTCUT_CANCEL_COMPILE": "Ctrl+Alt+C",
+    "SHORTCUT_RUN_TESTS": "F10",
+    "SHORTCUT_STRESS_TEST": "Ctrl+F10",
+    "SHORTCUT_MINIMIZE_TEST": "Ctrl+Shift+F10",
+    "SHORTCUT_RUN_INTERACTIVE": "Ctrl+F9",
     "SHORTCUT_CYCLE_EDITORS": "F3",
     "DEFAULT_WORKSPACE_DIR": os.path.expanduser("~/Desktop/algo"),
 }
@@ -169,6 +201,8 @@ class SettingsDialog(QDialog):
             ("Matched Brace Text", "EDITOR_BRACE_MATCHED_FG_COLOR"),
             ("Unmatched Brace Background", "EDITOR_BRACE_UNMATCHED_BG_COLOR"),
             ("Unmatched Brace Text", "EDITOR_BRACE_UNMATCHED_FG_COLOR"),
+            ("Error Underline", "EDITOR_ERROR_COLOR"),
+            ("Warning Underline", "EDITOR_WARNING_COLOR"),
         ]
         
         for label, setting in color_settings:
@@ -255,6 +289,97 @@ class SettingsDialog(QDialog):
         
         self.compile_debug_cmd = QLineEdit()
         compile_form.addRow("Debug Build:", self.compile_debug_cmd)
+
+        self.compile_use_pch = QCheckBox("Precompile bits/stdc++.h")
+        compile_form.addRow("", self.compile_use_pch)
+
+        self.compile_cache_size = QSpinBox()
+        self.compile_cache_size.setRange(0, 65536)
+        self.compile_cache_size.setSuffix(" MB")
+        compile_form.addRow("Build Cache Size:", self.compile_cache_size)
+
+        self.run_cache_size = QSpinBox()
+        self.run_cache_size.setRange(0, 65536)
+        self.run_cache_size.setSuffix(" MB")
+        self.run_cache_size.setSpecialValueText("Off")
+        compile_form.addRow("Run Cache Size:", self.run_cache_size)
+
+        self.speculative_build = QCheckBox("Build in the background on save")
+        compile_form.addRow("", self.speculative_build)
+
+        self.speculative_build_debug = QCheckBox("Also build the debug variant")
+        compile_form.addRow("", self.speculative_build_debug)
+
+        self.speculative_build_nice = QSpinBox()
+        self.speculative_build_nice.setRange(0, 19)
+        compile_form.addRow("Background Build Niceness:", self.speculative_build_nice)
+
+        self.speculative_build_jobs = QSpinBox()
+        self.speculative_build_jobs.setRange(1, 2)
+        compile_form.addRow("Background Build Jobs:", self.speculative_build_jobs)
+
+        self.idle_check = QCheckBox("Check syntax while typing")
+        compile_form.addRow("", self.idle_check)
+
+        self.idle_check_delay = QSpinBox()
+        self.idle_check_delay.setRange(100, 5000)
+        self.idle_check_delay.setSingleStep(100)
+        self.idle_check_delay.setSuffix(" ms")
+        compile_form.addRow("Check After Typing Pause:", self.idle_check_delay)
+
+        self.artifact_max_size = QSpinBox()
+        self.artifact_max_size.setRange(16, 65536)
+        self.artifact_max_size.setSuffix(" MB")
+        compile_form.addRow("Executables Size:", self.artifact_max_size)
+
+        self.artifacts_in_ram = QCheckBox("Keep executables in /dev/shm")
+        compile_form.addRow("", self.artifacts_in_ram)
+
+        self.test_time_limit = QDoubleSpinBox()
+        self.test_time_limit.setRange(0.1, 600)
+        self.test_time_limit.setSingleStep(0.5)
+        self.test_time_limit.setSuffix(" s")
+        compile_form.addRow("Test Time Limit:", self.test_time_limit)
+
+        self.run_time_limit = QDoubleSpinBox()
+        self.run_time_limit.setRange(0, 3600)
+        self.run_time_limit.setSingleStep(1)
+        self.run_time_limit.setSuffix(" s")
+        self.run_time_limit.setSpecialValueText("Unlimited")
+        compile_form.addRow("Run Time Limit:", self.run_time_limit)
+
+        self.run_memory_limit = QSpinBox()
+        self.run_memory_limit.setRange(0, 65536)
+        self.run_memory_limit.setSingleStep(256)
+        self.run_memory_limit.setSuffix(" MB")
+        self.run_memory_limit.setSpecialValueText("Unlimited")
+        compile_form.addRow("Memory Limit:", self.run_memory_limit)
+
+        self.run_stack_size = QSpinBox()
+        self.run_stack_size.setRange(0, 65536)
+        self.run_stack_size.setSingleStep(64)
+        self.run_stack_size.setSuffix(" MB")
+        self.run_stack_size.setSpecialValueText("Unlimited")
+        compile_form.addRow("Stack Size:", self.run_stack_size)
+
+        self.stress_iterations = QSpinBox()
+        self.stress_iterations.setRange(1, 10000000)
+        self.stress_iterations.setSingleStep(1000)
+        compile_form.addRow("Stress Iterations:", self.stress_iterations)
+
+        self.compare_abs_tolerance = QDoubleSpinBox()
+        self.compare_abs_tolerance.setDecimals(9)
+        self.compare_abs_tolerance.setRange(0, 1)
+        self.compare_abs_tolerance.setSingleStep(0.000001)
+        self.compare_abs_tolerance.setSpecialValueText("Exact")
+        compile_form.addRow("Absolute Error:", self.compare_abs_tolerance)
+
+        self.compare_rel_tolerance = QDoubleSpinBox()
+        self.compare_rel_tolerance.setDecimals(9)
+        self.compare_rel_tolerance.setRange(0, 1)
+        self.compare_rel_tolerance.setSingleStep(0.000001)
+        self.compare_rel_tolerance.setSpecialValueText("Exact")
+        compile_form.addRow("Relative Error:", self.compare_rel_tolerance)
         
         compilation_scroll_layout.addWidget(compile_group)
         
@@ -295,7 +420,13 @@ class SettingsDialog(QDialog):
             ("Toggle Terminal", "SHORTCUT_TOGGLE_TERMINAL"),
             ("Snippet Picker", "SHORTCUT_SNIPPET_PICKER"),
             ("Compile & Run", "SHORTCUT_COMPILE_RUN"),
+            ("Compile & Run Fresh", "SHORTCUT_COMPILE_RUN_FRESH"),
             ("Compile Debug", "SHORTCUT_COMPILE_DEBUG"),
+            ("Cancel Compile", "SHORTCUT_CANCEL_COMPILE"),
+            ("Run Tests", "SHORTCUT_RUN_TESTS"),
+            ("Stress Test", "SHORTCUT_STRESS_TEST"),
+            ("Minimize Test", "SHORTCUT_MINIMIZE_TEST"),
+            ("Run Interactive", "SHORTCUT_RUN_INTERACTIVE"),
             ("Cycle Editors", "SHORTCUT_CYCLE_EDITORS"),
         ]
         
@@ -368,6 +499,24 @@ class SettingsDialog(QDialog):
         # Set compilation settings
         self.compile_release_cmd.setText(current_settings.get("COMPILE_RELEASE_CMD", DEFAULT_SETTINGS["COMPILE_RELEASE_CMD"]))
         self.compile_debug_cmd.setText(current_settings.get("COMPILE_DEBUG_CMD", DEFAULT_SETTINGS["COMPILE_DEBUG_CMD"]))
+        self.compile_use_pch.setChecked(current_settings.get("COMPILE_USE_PCH", DEFAULT_SETTINGS["COMPILE_USE_PCH"]))
+        self.compile_cache_size.setValue(current_settings.get("COMPILE_CACHE_MAX_MB", DEFAULT_SETTINGS["COMPILE_CACHE_MAX_MB"]))
+        self.run_cache_size.setValue(current_settings.get("RUN_CACHE_MAX_MB", DEFAULT_SETTINGS["RUN_CACHE_MAX_MB"]))
+        self.speculative_build.setChecked(current_settings.get("SPECULATIVE_BUILD", DEFAULT_SETTINGS["SPECULATIVE_BUILD"]))
+        self.speculative_build_debug.setChecked(current_settings.get("SPECULATIVE_BUILD_DEBUG", DEFAULT_SETTINGS["SPECULATIVE_BUILD_DEBUG"]))
+        self.speculative_build_nice.setValue(current_settings.get("SPECULATIVE_BUILD_NICE", DEFAULT_SETTINGS["SPECULATIVE_BUILD_NICE"]))
+        self.speculative_build_jobs.setValue(current_settings.get("SPECULATIVE_BUILD_JOBS", DEFAULT_SETTINGS["SPECULATIVE_BUILD_JOBS"]))
+        self.idle_check.setChecked(current_settings.get("IDLE_CHECK", DEFAULT_SETTINGS["IDLE_CHECK"]))
+        self.idle_check_delay.setValue(current_settings.get("IDLE_CHECK_DELAY_MS", DEFAULT_SETTINGS["IDLE_CHECK_DELAY_MS"]))
+        self.artifact_max_size.setValue(current_settings.get("ARTIFACT_MAX_MB", DEFAULT_SETTINGS["ARTIFACT_MAX_MB"]))
+        self.artifacts_in_ram.setChecked(current_settings.get("ARTIFACTS_IN_RAM", DEFAULT_SETTINGS["ARTIFACTS_IN_RAM"]))
+        self.test_time_limit.setValue(current_settings.get("TEST_TIME_LIMIT", DEFAULT_SETTINGS["TEST_TIME_LIMIT"]))
+        self.run_time_limit.setValue(current_settings.get("RUN_TIME_LIMIT", DEFAULT_SETTINGS["RUN_TIME_LIMIT"]))
+        self.run_memory_limit.setValue(current_settings.get("RUN_MEMORY_LIMIT_MB", DEFAULT_SETTINGS["RUN_MEMORY_LIMIT_MB"]))
+        self.run_stack_size.setValue(current_settings.get("RUN_STACK_MB", DEFAULT_SETTINGS["RUN_STACK_MB"]))
+        self.stress_iterations.setValue(current_settings.get("STRESS_ITERATIONS", DEFAULT_SETTINGS["STRESS_ITERATIONS"]))
+        self.compare_abs_tolerance.setValue(current_settings.get("COMPARE_ABS_TOLERANCE", DEFAULT_SETTINGS["COMPARE_ABS_TOLERANCE"]))
+        self.compare_rel_tolerance.setValue(current_settings.get("COMPARE_REL_TOLERANCE", DEFAULT_SETTINGS["COMPARE_REL_TOLERANCE"]))
         self.default_workspace_dir.setText(current_settings.get("DEFAULT_WORKSPACE_DIR", DEFAULT_SETTINGS["DEFAULT_WORKSPACE_DIR"]))
         
         # Set shortcut settings
@@ -378,6 +527,8 @@ class SettingsDialog(QDialog):
         
     def save_settings(self):
         settings = DEFAULT_SETTINGS.copy()
+        # Keeps the settings that have no widget here as they were
+        settings.update(self.settings)
         
         settings.update({
             "EDITOR_FONT_FAMILY": self.font_family.currentText(),
@@ -392,6 +543,24 @@ class SettingsDialog(QDialog):
         # Save compilation settings
         settings["COMPILE_RELEASE_CMD"] = self.compile_release_cmd.text()
         settings["COMPILE_DEBUG_CMD"] = self.compile_debug_cmd.text()
+        settings["COMPILE_USE_PCH"] = self.compile_use_pch.isChecked()
+        settings["COMPILE_CACHE_MAX_MB"] = self.compile_cache_size.value()
+        settings["RUN_CACHE_MAX_MB"] = self.run_cache_size.value()
+        settings["SPECULATIVE_BUILD"] = self.speculative_build.isChecked()
+        settings["SPECULATIVE_BUILD_DEBUG"] = self.speculative_build_debug.isChecked()
+        settings["SPECULATIVE_BUILD_NICE"] = self.speculative_build_nice.value()
+        settings["SPECULATIVE_BUILD_JOBS"] = self.speculative_build_jobs.value()
+        settings["IDLE_CHECK"] = self.idle_check.isChecked()
+        settings["IDLE_CHECK_DELAY_MS"] = self.idle_check_delay.value()
+        settings["ARTIFACT_MAX_MB"] = self.artifact_max_size.value()
+        settings["ARTIFACTS_IN_RAM"] = self.artifacts_in_ram.isChecked()
+        settings["TEST_TIME_LIMIT"] = self.test_time_limit.value()
+        settings["RUN_TIME_LIMIT"] = self.run_time_limit.value()
+        settings["RUN_MEMORY_LIMIT_MB"] = self.run_memory_limit.value()
+        settings["RUN_STACK_MB"] = self.run_stack_size.value()
+        settings["STRESS_ITERATIONS"] = self.stress_iterations.value()
+        settings["COMPARE_ABS_TOLERANCE"] = self.compare_abs_tolerance.value()
+        settings["COMPARE_REL_TOLERANCE"] = self.compare_rel_tolerance.value()
         settings["DEFAULT_WORKSPACE_DIR"] = self.default_workspace_dir.text()
         
         # Save shortcut settings
@@ -416,7 +585,8 @@ class SettingsDialog(QDialog):
             if self.parent.parent().io_manager:
                 editors.extend([
                     self.parent.parent().io_manager.input_editor,
-                    self.parent.parent().io_manager.output_editor
+                    self.parent.parent().io_manager.output_editor,
+                    self.parent.parent().io_manager.error_editor
                 ])
             
             for editor in editors:
@@ -440,7 +610,8 @@ class SettingsDialog(QDialog):
         if self.parent.parent().io_manager:
             editors.extend([
                 self.parent.parent().io_manager.input_editor,
-                self.parent.parent().io_manager.output_editor
+                self.parent.parent().io_manager.output_editor,
+                self.parent.parent().io_manager.error_editor
             ])
 
         if not hasattr(self, 'settings'):
@@ -77,6 +77,17 @@ class TabManager:
             QMessageBox.critical(self.parent, "Error", f"Could not open file: {str(e)}")
             return False
 
+    def go_to(self, file_path, line, column=0):
+        """Open file_path with the cursor at a 1-based line and column"""
+        if not self.open_file(file_path):
+            return
+        editor = self.get_current_editor()
+        line = min(max(line - 1, 0), editor.lines() - 1)
+        index = min(max(column - 1, 0), len(editor.text(line).rstrip("\r\n")))
+        editor.setCursorPosition(line, index)
+        editor.ensureLineVisible(line)
+        editor.setFocus()
+
     def close_tab(self, index):
         self.tab_widget.removeTab(index)
 
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+RAM_DIR = "/dev/shm"
+
+class ArtifactStore:
+    """Build outputs keyed by full source path and build variant"""
+
+    def __init__(self, root, max_bytes, use_ram=False):
+        self.root = self.ram_root() if use_ram else None
+        if not self.root:
+            self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def ram_root(self):
+        if not os.path.isdir(RAM_DIR) or not os.access(RAM_DIR, os.W_OK):
+            return None
+        # Binaries can't be run from a noexec mount, which /dev/shm often is
+        if os.statvfs(RAM_DIR).f_flag & os.ST_NOEXEC:
+            return None
+        return os.path.join(RAM_DIR, f"eviver-{os.getuid()}", "artifacts")
+
+    def artifact_dir(self, source_path, variant):
+        source_path = os.path.abspath(source_path)
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        digest = hashlib.sha1(source_path.encode()).hexdigest()[:10]
+        return os.path.join(self.root, f"{name}-{digest}-{variant}")
+
+    def executable_path(self, source_path, variant):
+        directory = self.artifact_dir(source_path, variant)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, os.path.splitext(os.path.basename(source_path))[0])
+
+    def record(self, source_path, variant, command):
+        """Write metadata for a fresh executable and keep the store within max_bytes"""
+        directory = self.artifact_dir(source_path, variant)
+        executable = self.executable_path(source_path, variant)
+        if not os.path.isfile(executable):
+            return
+        with open(os.path.join(directory, "meta.json"), 'w') as f:
+            json.dump({
+                "source": os.path.abspath(source_path),
+                "variant": variant,
+                "command": command,
+                "built": time.time(),
+                "size": os.path.getsize(executable),
+            }, f, indent=4)
+        os.utime(directory)
+        self.evict(keep=directory)
+
+    def evict(self, keep=None):
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isdir(path):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+            except OSError:
+                continue
+            entries.append((os.stat(path).st_mtime, size, path))
+            total += size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,93 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from utils.run_limits import run_piped, kill_group
+import os
+import subprocess
+import threading
+
+class BuildWorker(QObject):
+    """Background job that builds some executables and then runs them many times"""
+
+    build_failed = pyqtSignal(str, str)
+    built = pyqtSignal(object)
+
+    def __init__(self, builds, working_dir, limits):
+        super().__init__()
+        self.builds = builds
+        self.working_dir = working_dir
+        self.limits = limits
+        self.lock = threading.Lock()
+        self.running = set()
+        self.stopped = False
+        self.jobs = len(builds)
+        self.nice = 0
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        raise NotImplementedError
+
+    def compile_all(self):
+        if not self.builds:
+            return True
+        with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(self.builds)))) as pool:
+            results = list(pool.map(self.compile, self.builds))
+        if self.stopped:
+            return False
+        for build, (exit_code, diagnostics) in zip(self.builds, results):
+            if exit_code != 0:
+                self.build_failed.emit(os.path.basename(build["source"]), diagnostics)
+                return False
+        return True
+
+    def compile(self, build):
+        command = ['/bin/sh', '-c', build["shell_command"]]
+        if self.nice:
+            command = ['nice', '-n', str(self.nice)] + command
+        # Started under the lock so a cancel() can't miss it
+        with self.lock:
+            if self.stopped:
+                return -1, ""
+            process = subprocess.Popen(
+                command,
+                cwd=build["working_dir"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            )
+            self.running.add(process)
+        try:
+            diagnostics = process.communicate()[1].decode(errors='replace')
+        finally:
+            with self.lock:
+                self.running.discard(process)
+        if process.returncode == 0:
+            # Warnings go into the compile cache with the executable
+            build["diagnostics"] = diagnostics
+            self.built.emit(build)
+        return process.returncode, diagnostics
+
+    def execute(self, executable, input_data, args=()):
+        """Run executable under the limits; returns (RunStats, stdout bytes)"""
+        processes = []
+
+        def register(process):
+            processes.append(process)
+            with self.lock:
+                self.running.add(process)
+
+        try:
+            return run_piped(executable, self.working_dir, input_data, self.limits, args, register)
+        finally:
+            with self.lock:
+                self.running.difference_update(processes)
+
+    def kill_all(self):
+        with self.lock:
+            for process in self.running:
+                kill_group(process)
+
+    def cancel(self):
+        self.stopped = True
+        self.kill_all()
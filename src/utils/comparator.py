@@ -0,0 +1,169 @@
+from utils.test_store import open_test_file
+import filecmp
+import io
+import re
+import shutil
+import subprocess
+
+CHUNK_SIZE = 1024 * 1024
+CHECKER_NAMES = ("{stem}_checker.cpp", "checker.cpp", "check.cpp")
+CHECKER_TIMEOUT = 30
+# testlib exit codes: 0 ok, 1 wrong answer, 2 presentation error, 3 checker failure
+CHECKER_VERDICTS = {0: "AC", 1: "WA", 2: "WA"}
+NUMBER = re.compile(rb'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?')
+INTEGER = re.compile(rb'[+-]?\d+')
+TOKEN = re.compile(rb'\S+')
+SHOWN_TOKEN = 40
+
+class Tolerance:
+    """Accepted error between numbers with a fraction or exponent; integers always compare exactly"""
+
+    def __init__(self, absolute=0.0, relative=0.0):
+        self.absolute = absolute
+        self.relative = relative
+
+    def __bool__(self):
+        return bool(self.absolute or self.relative)
+
+    def accepts(self, actual, expected):
+        if not self or not NUMBER.fullmatch(actual) or not NUMBER.fullmatch(expected):
+            return False
+        if INTEGER.fullmatch(actual) and INTEGER.fullmatch(expected):
+            return False
+        a, e = float(actual), float(expected)
+        return abs(a - e) <= self.absolute or abs(a - e) <= self.relative * abs(e)
+
+class TokenReader:
+    """Tokens of a file a chunk at a time, remembering enough to say which line one is on"""
+
+    def __init__(self, f):
+        self.f = f
+        self.tail = b""
+        self.block = b""
+        self.block_line = 1
+        self.tokens = []
+        self.pos = 0
+
+    def remaining(self):
+        return len(self.tokens) - self.pos
+
+    def fill(self):
+        """Read the next block holding whole tokens; False at the end of the file"""
+        while True:
+            self.block_line += self.block.count(b"\n")
+            chunk = self.f.read(CHUNK_SIZE)
+            data = self.tail + chunk
+            if not chunk:
+                self.block, self.tail = data, b""
+            else:
+                # Cut after the last whitespace so no token is split between blocks
+                cut = max(data.rfind(b" "), data.rfind(b"\n"), data.rfind(b"\t"), data.rfind(b"\r"))
+                self.block, self.tail = (data[:cut + 1], data[cut + 1:]) if cut >= 0 else (b"", data)
+            self.tokens = self.block.split()
+            self.pos = 0
+            if self.tokens or not chunk:
+                return bool(self.tokens)
+
+    def line_of(self, index):
+        """Line number of token index of the current block"""
+        for count, match in enumerate(TOKEN.finditer(self.block)):
+            if count == index:
+                return self.block_line + self.block.count(b"\n", 0, match.start())
+        return self.block_line + self.block.count(b"\n")
+
+class Difference:
+    """Where two outputs first disagree; a missing token is None"""
+
+    def __init__(self, token, actual_line, expected_line, actual, expected):
+        self.token = token
+        self.actual_line = actual_line
+        self.expected_line = expected_line
+        self.actual = actual
+        self.expected = expected
+
+    def __str__(self):
+        if self.actual is None:
+            return f"output ends after {self.token - 1} tokens, expected {shown(self.expected)} on line {self.expected_line}"
+        if self.expected is None:
+            return f"extra output {shown(self.actual)} on line {self.actual_line}"
+        where = f"line {self.actual_line}" if self.actual_line == self.expected_line \
+            else f"line {self.actual_line} (expected line {self.expected_line})"
+        return f"{where}, token {self.token}: expected {shown(self.expected)}, found {shown(self.actual)}"
+
+def shown(token):
+    text = token.decode(errors='replace')
+    return repr(text if len(text) <= SHOWN_TOKEN else text[:SHOWN_TOKEN] + "...")
+
+def compare_streams(actual, expected, tolerance=None):
+    """First Difference between two binary streams, token by token, or None if they match"""
+    tolerance = tolerance or Tolerance()
+    a, e = TokenReader(actual), TokenReader(expected)
+    compared = 0
+    while True:
+        if not a.remaining():
+            a.fill()
+        if not e.remaining():
+            e.fill()
+        count = min(a.remaining(), e.remaining())
+        if not count:
+            if not a.remaining() and not e.remaining():
+                return None
+            token = compared + 1
+            if not a.remaining():
+                return Difference(token, None, e.line_of(e.pos), None, e.tokens[e.pos])
+            return Difference(token, a.line_of(a.pos), None, a.tokens[a.pos], None)
+        # Whole blocks at once; tokens are only looked at one by one in a block that differs
+        ours = a.tokens[a.pos:a.pos + count]
+        theirs = e.tokens[e.pos:e.pos + count]
+        if ours != theirs:
+            for index, (x, y) in enumerate(zip(ours, theirs)):
+                if x != y and not tolerance.accepts(x, y):
+                    return Difference(compared + index + 1, a.line_of(a.pos + index),
+                                      e.line_of(e.pos + index), x, y)
+        a.pos += count
+        e.pos += count
+        compared += count
+
+def compare_files(actual_path, expected_path, tolerance=None):
+    if not expected_path.endswith(".gz") and filecmp.cmp(actual_path, expected_path, shallow=False):
+        # Byte for byte equal, the usual case for an accepted test
+        return None
+    with open(actual_path, 'rb') as actual, open_test_file(expected_path) as expected:
+        return compare_streams(actual, expected, tolerance)
+
+def compare_bytes(actual, expected, tolerance=None):
+    """compare_streams for outputs already in memory"""
+    if not tolerance and actual.split() == expected.split():
+        return None
+    return compare_streams(io.BytesIO(actual), io.BytesIO(expected), tolerance)
+
+def run_checker(checker, input_path, output_path, expected_path):
+    """Verdict and message of a testlib-style checker: checker <input> <output> <answer>"""
+    try:
+        result = subprocess.run([checker, input_path, output_path, expected_path],
+                                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE, timeout=CHECKER_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return "FAIL", "checker timed out"
+    message = result.stderr.decode(errors='replace').strip()
+    return CHECKER_VERDICTS.get(result.returncode, "FAIL"), message
+
+class Judge:
+    """Decides a test from its output: a custom checker when there is one, otherwise compare_files"""
+
+    def __init__(self, tolerance=None, checker=None):
+        self.tolerance = tolerance or Tolerance()
+        self.checker = checker
+
+    def judge(self, input_path, output_path, expected_path):
+        """(verdict, message) with verdict AC, WA or FAIL"""
+        if self.checker:
+            if expected_path.endswith(".gz"):
+                # testlib reads plain files only
+                plain = output_path + ".ans"
+                with open_test_file(expected_path) as source, open(plain, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                expected_path = plain
+            return run_checker(self.checker, input_path, output_path, expected_path)
+        difference = compare_files(output_path, expected_path, self.tolerance)
+        return ("WA", str(difference)) if difference else ("AC", "")
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import time
+
+LOCAL_INCLUDE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"([^"\n]+)"', re.MULTILINE)
+CACHED_EXECUTABLE = "program"
+
+versions = {}
+
+def compiler_version(compiler):
+    """`compiler --version` for the resolved binary, re-queried only when it changes"""
+    path = shutil.which(compiler)
+    if not path:
+        return None
+    path = os.path.realpath(path)
+    mtime = os.stat(path).st_mtime
+    cached = versions.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    version = f"{path}\n{result.stdout}"
+    versions[path] = (mtime, version)
+    return version
+
+class CompileCache:
+    """Executables keyed by everything that can change the build output, local headers included"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, source_path, command):
+        try:
+            compiler = shlex.split(command)[0]
+        except (ValueError, IndexError):
+            return None
+        version = compiler_version(compiler)
+        if version is None:
+            return None
+
+        digest = hashlib.sha256()
+        digest.update(version.encode())
+        digest.update(b"\0" + command.encode() + b"\0")
+        try:
+            self.hash_sources(source_path, digest)
+        except OSError:
+            return None
+        return digest.hexdigest()[:32]
+
+    def hash_sources(self, source_path, digest):
+        pending = [os.path.abspath(source_path)]
+        seen = set()
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            digest.update(path.encode() + b"\0")
+            if not os.path.isfile(path):
+                digest.update(b"missing\0")
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest.update(hashlib.sha256(data).digest())
+            directory = os.path.dirname(path)
+            for name in LOCAL_INCLUDE.findall(data):
+                pending.append(os.path.normpath(os.path.join(directory, os.fsdecode(name))))
+
+    def lookup(self, key):
+        """Return (executable, diagnostics) for a cached build, or None"""
+        if not key:
+            return None
+        entry = os.path.join(self.root, key)
+        executable = os.path.join(entry, CACHED_EXECUTABLE)
+        if not os.path.isfile(executable):
+            return None
+        try:
+            with open(os.path.join(entry, "diagnostics.txt"), 'r') as f:
+                diagnostics = f.read()
+        except OSError:
+            diagnostics = ""
+        os.utime(entry)
+        return executable, diagnostics
+
+    def store(self, key, source_path, command, executable, diagnostics):
+        if not key or not os.path.isfile(executable):
+            return
+        entry = os.path.join(self.root, key)
+        staging = entry + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            os.makedirs(staging)
+            copy_executable(executable, os.path.join(staging, CACHED_EXECUTABLE))
+            with open(os.path.join(staging, "diagnostics.txt"), 'w') as f:
+                f.write(diagnostics)
+            with open(os.path.join(staging, "meta.json"), 'w') as f:
+                json.dump({
+                    "source": source_path,
+                    "command": command,
+                    "size": os.path.getsize(executable),
+                    "created": time.time(),
+                }, f, indent=4)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.evict()
+
+    def restore(self, cached, executable):
+        """Put a cached executable at the path the build would have written"""
+        copy_executable(cached, executable)
+
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                size = os.path.getsize(os.path.join(path, CACHED_EXECUTABLE))
+                entries.append((os.stat(path).st_mtime, size, path))
+                total += size
+            except OSError:
+                continue
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+def copy_executable(source, target):
+    # Copied rather than linked so a linker rewriting target in place can't corrupt the cache,
+    # and swapped in by rename so an older copy that is still running is left alone
+    staging = target + ".tmp"
+    shutil.copy2(source, staging)
+    os.replace(staging, target)
@@ -0,0 +1,137 @@
+import os
+import re
+
+KINDS = {"fatal error": "error", "error": "error", "warning": "warning", "note": "note"}
+ESCAPE = re.compile(r"\x1b\[[0-9;]*[mK]")
+# Source excerpts under a message: "    6 |   code", "      |   ^~~" and "  +++ |+fix"
+SNIPPET = re.compile(r"^\s*(?:\d+|\+\+\+)?\s*\|")
+INCLUDED = re.compile(r"^(?:In file included|\s+) from (?P<file>.+?):(?P<line>\d+)(?::(?P<column>\d+))?[,:]$")
+LOCATED = re.compile(r"^(?P<file>[^\s:][^:]*):(?P<line>\d+):(?:(?P<column>\d+):)? (?:(?P<kind>fatal error|error|warning|note): )?(?P<message>.*)$")
+# "a.cpp:(.text+0x5): undefined reference to `foo()'" from the linker
+LINKER = re.compile(r"^(?P<file>[^\s:][^:]*):\([^)]*\): (?P<message>.*)$")
+UNLOCATED = re.compile(r"^(?P<file>[^\s:][^:]*): (?:(?P<kind>fatal error|error|warning|note): )?(?P<message>.*)$")
+
+class Record:
+    """One compiler message, with the context that led up to it and the notes after it"""
+
+    def __init__(self, kind, path, line, column, message):
+        # "context" is an "In instantiation of" or "required from" line
+        self.kind = kind
+        # None when the message is not about a file; line and column are 0 when unknown
+        self.path = path
+        self.line = line
+        self.column = column
+        self.message = message
+        self.context = []
+        self.notes = []
+        self.count = 1
+        # Where in the compiled source it is anchored, for an error deep in a header the line that led there
+        self.primary = (path, line, column)
+
+    def location(self):
+        if not self.path:
+            return ""
+        name = os.path.basename(self.path)
+        if not self.line:
+            return name
+        return f"{name}:{self.line}:{self.column}" if self.column else f"{name}:{self.line}"
+
+class OutputParser:
+    """Turns g++'s stderr into Records as it streams in"""
+
+    def __init__(self, source_path, working_dir):
+        self.source_path = os.path.abspath(source_path)
+        self.working_dir = working_dir
+        self.partial = ""
+        self.context = []
+        self.current = None
+        self.seen = {}
+        self.records = []
+
+    def feed(self, text):
+        """Events for the complete lines in text: ("record", record), ("note", record, note) or ("repeat", record)"""
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        events = []
+        for line in lines:
+            self.parse_line(line, events)
+        return events
+
+    def finish(self):
+        events = []
+        if self.partial:
+            self.parse_line(self.partial, events)
+            self.partial = ""
+        return events
+
+    def resolve(self, path):
+        return os.path.normpath(os.path.join(self.working_dir, path))
+
+    def parse_line(self, line, events):
+        line = ESCAPE.sub("", line.rstrip("\r"))
+        if not line.strip() or SNIPPET.match(line):
+            return
+
+        match = INCLUDED.match(line)
+        if match:
+            self.add_context(Record("context", self.resolve(match["file"]), int(match["line"]),
+                                    int(match["column"] or 0), "included from here"))
+            return
+
+        match = LOCATED.match(line)
+        if match:
+            record = Record(KINDS.get(match["kind"], "context"), self.resolve(match["file"]),
+                            int(match["line"]), int(match["column"] or 0), match["message"].strip())
+        else:
+            match = LINKER.match(line)
+            if match:
+                record = Record("error", self.resolve(match["file"]), 0, 0, match["message"].strip())
+            else:
+                match = UNLOCATED.match(line)
+                if not match:
+                    return
+                # Driver and linker messages such as "collect2: error: ..." name a program, not a file
+                path = self.resolve(match["file"])
+                record = Record(KINDS.get(match["kind"], "context"), path if os.path.isfile(path) else None,
+                                0, 0, match["message"].strip())
+
+        if record.kind == "context":
+            self.add_context(record)
+        elif record.kind == "note":
+            if self.current is None:
+                self.add_context(record)
+            elif self.current is not False:
+                self.current.notes.append(record)
+                events.append(("note", self.current, record))
+        else:
+            self.add_record(record, events)
+
+    def add_context(self, record):
+        # A function or instantiation header starts a new chain of context
+        if record.kind == "context" and record.message.startswith("In "):
+            self.context = [entry for entry in self.context if entry.message == "included from here"]
+        self.context.append(record)
+
+    def add_record(self, record, events):
+        record.context = self.context
+        self.context = []
+        for entry in reversed(record.context):
+            if entry.path == self.source_path and entry.line:
+                # The last step into the compiled source, e.g. "required from here"
+                record.primary = (entry.path, entry.line, entry.column)
+                break
+        if record.path == self.source_path:
+            record.primary = (record.path, record.line, record.column)
+
+        key = (record.kind, record.primary, record.message)
+        if key in self.seen:
+            repeated = self.seen[key]
+            repeated.count += 1
+            # Its notes repeat too
+            self.current = False
+            events.append(("repeat", repeated))
+            return
+        self.seen[key] = record
+        self.records.append(record)
+        self.current = record
+        events.append(("record", record))
@@ -0,0 +1,175 @@
+from PyQt6.QtCore import pyqtSignal
+from utils.build_worker import BuildWorker
+from utils.comparator import CHECKER_VERDICTS
+from utils.run_limits import spawn, stop, wait_with_limits
+import os
+import subprocess
+import threading
+import time
+
+INTERACTOR_NAMES = ("{stem}_interactor.cpp", "interactor.cpp", "interact.cpp")
+PIPE_CHUNK = 64 * 1024
+# How long the solution may keep running once the interactor is done
+IDLE_GRACE = 1.0
+
+def close_quietly(stream):
+    try:
+        stream.close()
+    except OSError:
+        pass
+
+class Transcript:
+    """What went each way between the two programs, as "> " and "< " lines, up to limit bytes"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.data = bytearray()
+        self.dropped = 0
+        self.direction = None
+        self.line_start = True
+        self.lock = threading.Lock()
+
+    def record(self, direction, chunk):
+        with self.lock:
+            out = bytearray()
+            if not self.line_start and direction != self.direction:
+                out += b"\n"
+                self.line_start = True
+            for piece in chunk.splitlines(keepends=True):
+                if self.line_start:
+                    out += direction
+                out += piece
+                self.line_start = piece.endswith(b"\n")
+            self.direction = direction
+            room = max(self.limit - len(self.data), 0)
+            self.data += out[:room]
+            self.dropped += max(len(out) - room, 0)
+
+    def text(self):
+        text = self.data.decode(errors='replace')
+        if self.dropped:
+            text += f"\n[{self.dropped} more bytes not shown]\n"
+        return text
+
+class InteractiveRunner(BuildWorker):
+    """Runs a solution against an interactor, each one's stdout piped to the other's stdin"""
+
+    finished = pyqtSignal(str, str, object, object)
+
+    def __init__(self, builds, interactor, solution, working_dir, limits, input_path, output_path, log_limit):
+        super().__init__(builds, working_dir, limits)
+        self.interactor = interactor
+        self.solution = solution
+        self.input_path = input_path
+        self.output_path = output_path
+        self.transcript = Transcript(log_limit)
+        self.errors = Transcript(log_limit)
+        self.log_limit = log_limit
+
+    def run(self):
+        if not self.compile_all():
+            self.finished.emit("", "", None, None)
+            return
+        try:
+            self.finished.emit(*self.interact())
+        except OSError as e:
+            self.kill_all()
+            self.finished.emit("FAIL", f"could not run ({e})", None, None)
+
+    def interact(self):
+        start = time.perf_counter()
+        # testlib style: interactor <input> <output>
+        interactor, interactor_fd = spawn(self.interactor, self.working_dir, self.limits,
+                                          subprocess.PIPE, subprocess.PIPE, subprocess.PIPE,
+                                          (self.input_path, self.output_path))
+        self.register(interactor)
+        try:
+            solution, solution_fd = spawn(self.solution, self.working_dir, self.limits,
+                                          subprocess.PIPE, subprocess.PIPE, subprocess.PIPE)
+        except OSError:
+            stop(interactor, self.limits)
+            wait_with_limits(interactor, interactor_fd, self.limits, start)
+            raise
+        self.register(solution)
+
+        message = []
+        threads = [
+            threading.Thread(target=self.relay, args=(solution.stdout, interactor.stdin, b"> "), daemon=True),
+            threading.Thread(target=self.relay, args=(interactor.stdout, solution.stdin, b"< "), daemon=True),
+            threading.Thread(target=self.relay, args=(solution.stderr, None, b""), daemon=True),
+            threading.Thread(target=self.collect, args=(interactor.stderr, message), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        results = {}
+        solution_done = threading.Event()
+
+        def wait_solution():
+            results["solution"] = wait_with_limits(solution, solution_fd, self.limits, start)
+            solution_done.set()
+
+        waiter = threading.Thread(target=wait_solution, daemon=True)
+        waiter.start()
+        interactor_stats = wait_with_limits(interactor, interactor_fd, self.limits, start)
+        idle = not solution_done.wait(IDLE_GRACE)
+        if idle:
+            stop(solution, self.limits)
+        waiter.join()
+        for thread in threads:
+            thread.join()
+        with self.lock:
+            self.running.difference_update((interactor, solution))
+
+        solution_stats = results["solution"]
+        message = b"".join(message).decode(errors='replace').strip()
+        return self.verdict(solution_stats, interactor_stats, idle), message, solution_stats, interactor_stats
+
+    def verdict(self, solution, interactor, idle):
+        if self.stopped:
+            return "--"
+        if solution.verdict != "OK" and not idle and interactor.exit_code != 3:
+            # A crash shows up to the interactor as an early end of input, and a
+            # deadlock times both out, so the solution's failure comes first
+            return solution.verdict
+        if interactor.verdict not in ("OK", "RE"):
+            # The interactor itself ran out of time or memory
+            return "FAIL"
+        verdict = CHECKER_VERDICTS.get(interactor.exit_code, "FAIL")
+        # Still waiting for more after the interactor accepted
+        return "TLE" if verdict == "AC" and idle else verdict
+
+    def register(self, process):
+        with self.lock:
+            self.running.add(process)
+
+    def relay(self, source, target, direction):
+        """Copy source to target as it arrives until source closes, logging it; one thread per direction"""
+        log = self.transcript if target is not None else self.errors
+        try:
+            while True:
+                chunk = os.read(source.fileno(), PIPE_CHUNK)
+                if not chunk:
+                    break
+                log.record(direction, chunk)
+                if target is not None:
+                    try:
+                        view = memoryview(chunk)
+                        while view:
+                            view = view[os.write(target.fileno(), view):]
+                    except OSError:
+                        # The other side is gone; keep draining so this one can't block
+                        close_quietly(target)
+                        target = None
+        finally:
+            source.close()
+            if target is not None:
+                close_quietly(target)
+
+    def collect(self, source, parts):
+        size = 0
+        with source:
+            for chunk in iter(lambda: os.read(source.fileno(), PIPE_CHUNK), b""):
+                if size < self.log_limit:
+                    parts.append(chunk)
+                    size += len(chunk)
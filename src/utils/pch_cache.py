@@ -0,0 +1,116 @@
+from PyQt6.QtCore import QProcess
+from utils.compile_cache import compiler_version
+import hashlib
+import json
+import os
+import shlex
+import shutil
+
+PCH_HEADER = "bits/stdc++.h"
+PCH_MAX_ENTRIES = 4
+SHELL_OPERATORS = {"&&", "||", ";", "|", "&", ">", "<"}
+
+class PCHCache:
+    """Precompiled <bits/stdc++.h> per compiler version and flag set"""
+
+    def __init__(self, root):
+        self.root = root
+        self.builds = {}
+        self.failed = set()
+
+    def split_command(self, compile_cmd):
+        """Return (compiler, flags) for a single g++ invocation, or None"""
+        try:
+            tokens = shlex.split(compile_cmd)
+        except ValueError:
+            return None
+        if not tokens or SHELL_OPERATORS.intersection(tokens):
+            return None
+
+        compiler = tokens[0]
+        name = os.path.basename(compiler)
+        if 'clang' in name or not ('g++' in name or name == 'c++'):
+            return None
+
+        flags = []
+        skip = False
+        for token in tokens[1:]:
+            if skip:
+                skip = False
+            elif token == '-o':
+                skip = True
+            elif '{source}' in token or '{executable}' in token:
+                continue
+            else:
+                flags.append(token)
+        return compiler, flags
+
+    def entry_dir(self, compiler, flags, version):
+        key = hashlib.sha1("\0".join([version, compiler] + flags).encode()).hexdigest()[:16]
+        return os.path.join(self.root, key)
+
+    def include_flag(self, compile_cmd):
+        """Return the -I option that enables the cached PCH for compile_cmd, or "" while it is being built"""
+        command = self.split_command(compile_cmd)
+        if not command:
+            return ""
+        compiler, flags = command
+        version = compiler_version(compiler)
+        if not version:
+            return ""
+
+        entry = self.entry_dir(compiler, flags, version)
+        if os.path.exists(os.path.join(entry, PCH_HEADER + ".gch")):
+            # First on the include path, g++ takes the .gch in place of the real header
+            os.utime(entry)
+            return f"-I{shlex.quote(entry)}"
+
+        if entry not in self.builds and entry not in self.failed:
+            self.build(entry, compiler, flags, version)
+        return ""
+
+    def build(self, entry, compiler, flags, version):
+        os.makedirs(os.path.join(entry, os.path.dirname(PCH_HEADER)), exist_ok=True)
+        stub = os.path.join(entry, "pch.h")
+        with open(stub, 'w') as f:
+            f.write(f"#include <{PCH_HEADER}>\n")
+        with open(os.path.join(entry, "meta.json"), 'w') as f:
+            json.dump({"compiler": compiler, "flags": flags, "version": version}, f, indent=4)
+
+        # Written under a temporary name so a half-built PCH is never picked up
+        target = os.path.join(entry, PCH_HEADER + ".gch")
+        process = QProcess()
+        process.setWorkingDirectory(entry)
+        process.finished.connect(lambda exit_code, exit_status: self.on_build_finished(entry, target, exit_code, exit_status))
+        self.builds[entry] = process
+        process.start(compiler, flags + ['-x', 'c++-header', stub, '-o', target + ".tmp"])
+
+    def on_build_finished(self, entry, target, exit_code, exit_status):
+        process = self.builds.pop(entry)
+        process.deleteLater()
+        if exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0:
+            os.replace(target + ".tmp", target)
+            self.prune()
+        else:
+            # Not retried this session, the flags probably don't allow a PCH
+            self.failed.add(entry)
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def shutdown(self):
+        """Kill PCH builds still running, before the application exits, and drop their partial output"""
+        for entry, process in list(self.builds.items()):
+            process.finished.disconnect()
+            process.kill()
+            process.waitForFinished(1000)
+            del self.builds[entry]
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def prune(self):
+        entries = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path) and path not in self.builds:
+                entries.append((os.stat(path).st_mtime, path))
+        entries.sort(reverse=True)
+        for _, path in entries[PCH_MAX_ENTRIES:]:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,68 @@
+import os
+import time
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+def children(pid):
+    pids = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children", 'r') as f:
+                pids.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return pids
+
+def cpu_ticks(pid):
+    with open(f"/proc/{pid}/stat", 'rb') as f:
+        # The command name may contain spaces, so fields are counted after its ')'
+        fields = f.read().rsplit(b')', 1)[1].split()
+    return int(fields[11]) + int(fields[12])
+
+def rss_bytes(pid):
+    with open(f"/proc/{pid}/status", 'rb') as f:
+        for line in f:
+            if line.startswith(b"VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+class ProcSampler:
+    """CPU use and resident memory of a process tree, read from /proc"""
+
+    def __init__(self, pid, skip_root=False):
+        # skip_root leaves out pid itself, when it is only the launcher waiting on the program
+        self.pid = pid
+        self.skip_root = skip_root
+        self.last_ticks = None
+        self.last_time = None
+
+    def processes(self):
+        pids = []
+        pending = [self.pid]
+        while pending:
+            pid = pending.pop()
+            pids.append(pid)
+            pending.extend(children(pid))
+        return pids[1:] if self.skip_root else pids
+
+    def sample(self):
+        """Return (percent of one core since the last sample, rss_bytes), or None once the process is gone"""
+        if not os.path.exists(f"/proc/{self.pid}"):
+            return None
+        ticks = 0
+        rss = 0
+        for pid in self.processes():
+            try:
+                ticks += cpu_ticks(pid)
+                rss += rss_bytes(pid)
+            except (OSError, IndexError, ValueError):
+                # Exited between listing and reading
+                continue
+
+        now = time.monotonic()
+        cpu = 0.0
+        if self.last_ticks is not None and now > self.last_time:
+            cpu = max(ticks - self.last_ticks, 0) / CLOCK_TICKS / (now - self.last_time) * 100
+        self.last_ticks = ticks
+        self.last_time = now
+        return cpu, rss
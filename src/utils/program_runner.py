@@ -0,0 +1,73 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.run_limits import RunLimits, spawn, stop, wait_with_limits
+import os
+import subprocess
+import threading
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+class ProgramRunner(QObject):
+    """Runs a program with stdout and stderr drained into sinks by background threads"""
+
+    finished = pyqtSignal(object)
+
+    def __init__(self, executable, working_dir, input_path, stdout_sink, stderr_sink, limits=None):
+        super().__init__()
+        self.executable = executable
+        self.working_dir = working_dir
+        self.input_path = input_path
+        self.stdout_sink = stdout_sink
+        self.stderr_sink = stderr_sink
+        self.limits = limits or RunLimits()
+        self.process = None
+        self.exited = threading.Event()
+        self.killed = False
+        self.cache_key = None
+
+    def start(self):
+        with open(self.input_path, 'rb') as stdin:
+            start = time.perf_counter()
+            self.process, stats_fd = spawn(self.executable, self.working_dir, self.limits,
+                                           stdin, subprocess.PIPE, subprocess.PIPE)
+        # One reader per stream, so the program never blocks on a full pipe however busy the GUI is
+        readers = [
+            threading.Thread(target=self.pump, args=(self.process.stdout, self.stdout_sink), daemon=True),
+            threading.Thread(target=self.pump, args=(self.process.stderr, self.stderr_sink), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        threading.Thread(target=self.wait_for_exit, args=(readers, stats_fd, start), daemon=True).start()
+
+    def pump(self, stream, sink):
+        fd = stream.fileno()
+        while True:
+            data = os.read(fd, CHUNK_SIZE)
+            if not data:
+                break
+            try:
+                sink.write(data)
+            except OSError:
+                # Keep draining even if output.txt can't be written, or the child would block
+                pass
+        stream.close()
+
+    def wait_for_exit(self, readers, stats_fd, start):
+        stats = wait_with_limits(self.process, stats_fd, self.limits, start)
+        self.exited.set()
+        for reader in readers:
+            reader.join()
+        self.finished.emit(stats)
+
+    def is_running(self):
+        # Not poll(): only the waiter thread may reap, or the rusage is lost
+        return self.process is not None and not self.exited.is_set()
+
+    def kill(self):
+        if self.is_running():
+            self.killed = True
+            stop(self.process, self.limits)
+
+    def wait(self):
+        if self.process:
+            self.exited.wait()
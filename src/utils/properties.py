@@ -29,6 +29,8 @@ EDITOR_BRACE_MATCHED_BG_COLOR = QColor("#404040")
 EDITOR_BRACE_MATCHED_FG_COLOR = QColor("#00FF00")
 EDITOR_BRACE_UNMATCHED_BG_COLOR = QColor("#802020")
 EDITOR_BRACE_UNMATCHED_FG_COLOR = QColor("#FF0000")
+EDITOR_ERROR_COLOR = QColor("#FF5555")
+EDITOR_WARNING_COLOR = QColor("#E5C07B")
 
 SYNTAX_DEFAULT = QColor("#d7d7d7")
 SYNTAX_COMMENT = QColor("#FFFF7F")
@@ -53,6 +55,32 @@ TERMINAL_HEIGHT = 32
 # Default values for settings that can now be overridden by settings.json
 COMPILE_RELEASE_CMD = 'g++ -DLOCAL -std=c++17 -Wshadow -Wall -o "{executable}" "{source}" -O2 -Wno-unused-result'
 COMPILE_DEBUG_CMD = 'g++ -DLOCAL -std=c++17 -Wshadow -Wall -o "{executable}" "{source}" -g -D_GLIBCXX_DEBUG'
+COMPILE_USE_PCH = True
+COMPILE_CACHE_MAX_MB = 512
+RUN_CACHE_MAX_MB = 256
+SPECULATIVE_BUILD = False
+SPECULATIVE_BUILD_DEBUG = False
+SPECULATIVE_BUILD_NICE = 10
+SPECULATIVE_BUILD_JOBS = 1
+IDLE_CHECK = True
+IDLE_CHECK_DELAY_MS = 400
+ARTIFACT_MAX_MB = 256
+ARTIFACTS_IN_RAM = False
+
+OUTPUT_FLUSH_RATE = 30
+OUTPUT_PANE_MAX_KB = 4096
+STDERR_PANE_MAX_KB = 256
+STDERR_DISCARD = False
+
+TEST_TIME_LIMIT = 2.0
+RUN_TIME_LIMIT = 10.0
+RUN_MEMORY_LIMIT_MB = 1024
+RUN_STACK_MB = 0
+STRESS_ITERATIONS = 10000
+COMPARE_ABS_TOLERANCE = 0.0
+COMPARE_REL_TOLERANCE = 0.0
+TEST_COMPRESS_ABOVE_KB = 1024
+IO_EDITOR_MAX_KB = 1024
 
 SHORTCUT_NEW_FILE = "Ctrl+N"
 SHORTCUT_OPEN_FILE = "Ctrl+O"
@@ -65,7 +93,13 @@ SHORTCUT_TOGGLE_IO = "Ctrl+I"
 SHORTCUT_TOGGLE_TERMINAL = "Ctrl+`"
 SHORTCUT_SNIPPET_PICKER = "Ctrl+J"
 SHORTCUT_COMPILE_RUN = "Ctrl+Alt+N"
+SHORTCUT_COMPILE_RUN_FRESH = "Ctrl+Alt+Shift+N"
 SHORTCUT_COMPILE_DEBUG = "F9"
+SHORTCUT_CANCEL_COMPILE = "Ctrl+Alt+C"
+SHORTCUT_RUN_TESTS = "F10"
+SHORTCUT_STRESS_TEST = "Ctrl+F10"
+SHORTCUT_MINIMIZE_TEST = "Ctrl+Shift+F10"
+SHORTCUT_RUN_INTERACTIVE = "Ctrl+F9"
 SHORTCUT_CYCLE_EDITORS = "F3"
 
 DEFAULT_WORKSPACE_DIR = os.path.expanduser("~/Desktop/algo")
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from utils.run_limits import RunStats
+
+STDOUT_FILE = "stdout"
+STDERR_FILE = "stderr"
+META_FILE = "meta.json"
+
+hashes = {}
+
+def file_hash(path):
+    """sha256 of a file, recomputed only when its size or mtime changes"""
+    stat = os.stat(path)
+    stamp = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    cached = hashes.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    hashes[path] = (stamp, digest.hexdigest())
+    return hashes[path][1]
+
+class RunCache:
+    """Results of earlier runs keyed by the executable, the input and the limits"""
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    def key(self, executable, input_path, limits):
+        if not self.max_bytes:
+            return None
+        digest = hashlib.sha256()
+        try:
+            digest.update(file_hash(executable).encode() + b"\0")
+            digest.update(file_hash(input_path).encode() + b"\0")
+        except OSError:
+            return None
+        digest.update(f"{limits.time_limit} {limits.memory_mb} {limits.stack_mb} {bool(limits.launcher)}".encode())
+        return digest.hexdigest()[:32]
+
+    def lookup(self, key, limits):
+        """Return (RunStats, stdout path, stderr path) of a cached run, or None"""
+        if not key:
+            return None
+        entry = os.path.join(self.root, key)
+        try:
+            with open(os.path.join(entry, META_FILE), 'r') as f:
+                meta = json.load(f)
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        stats = RunStats(meta["status"], meta["cpu"], meta["max_rss_kb"], meta["wall"], limits, meta["timed_out"])
+        stats.cached = True
+        return stats, os.path.join(entry, STDOUT_FILE), os.path.join(entry, STDERR_FILE)
+
+    def store(self, key, stats, stdout_path, stderr_path):
+        if not key:
+            return
+        try:
+            size = os.path.getsize(stdout_path) + os.path.getsize(stderr_path)
+        except OSError:
+            return
+        if size > self.max_bytes // 4:
+            # Not worth pushing most of the cache out for one run
+            return
+        entry = os.path.join(self.root, key)
+        staging = entry + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            os.makedirs(staging)
+            shutil.copyfile(stdout_path, os.path.join(staging, STDOUT_FILE))
+            shutil.copyfile(stderr_path, os.path.join(staging, STDERR_FILE))
+            with open(os.path.join(staging, META_FILE), 'w') as f:
+                json.dump({
+                    "status": stats.status,
+                    "cpu": stats.cpu,
+                    "max_rss_kb": stats.max_rss_kb,
+                    "wall": stats.wall,
+                    "timed_out": stats.timed_out,
+                    "size": size,
+                    "created": time.time(),
+                }, f, indent=4)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                with open(os.path.join(path, META_FILE), 'r') as f:
+                    size = json.load(f)["size"]
+                entries.append((os.stat(path).st_mtime, size, path))
+                total += size
+            except (OSError, ValueError, KeyError):
+                continue
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,230 @@
+import hashlib
+import math
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+
+LAUNCHER_SOURCE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources", "launcher.c")
+LAUNCHER_COMPILERS = ("cc", "gcc", "clang")
+
+# Used when the launcher can't be built: applies the limits and becomes the
+# program, so times are right but the peak RSS includes the editor's own
+SHELL_LAUNCHER = 'ulimit -s {stack} 2>/dev/null; ulimit -t {cpu} 2>/dev/null; ulimit -v {memory} 2>/dev/null; exec "$0" "$@"'
+
+def build_launcher(directory):
+    """Compile resources/launcher.c into directory once; return its path or None"""
+    try:
+        with open(LAUNCHER_SOURCE, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    except OSError:
+        return None
+    path = os.path.join(directory, f"launcher-{digest}")
+    if os.access(path, os.X_OK):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    for compiler in LAUNCHER_COMPILERS:
+        if not shutil.which(compiler):
+            continue
+        try:
+            result = subprocess.run([compiler, "-O2", "-o", path + ".tmp", LAUNCHER_SOURCE],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+        if result.returncode == 0:
+            os.replace(path + ".tmp", path)
+            for name in os.listdir(directory):
+                if name.startswith("launcher-") and name != os.path.basename(path):
+                    os.remove(os.path.join(directory, name))
+            return path
+    return None
+
+class RunLimits:
+    """Time and memory limits for one run of a solution; 0 means unlimited"""
+
+    def __init__(self, time_limit=0, memory_mb=0, stack_mb=0, launcher=None):
+        self.time_limit = time_limit
+        self.memory_mb = memory_mb
+        self.stack_mb = stack_mb
+        self.launcher = launcher
+
+    def wall_limit(self):
+        # Stops sleeping or blocked programs, which use no CPU time
+        if not self.time_limit:
+            return None
+        return max(self.time_limit * 2, self.time_limit + 1)
+
+    def command(self, executable, stats_fd, args=()):
+        cpu = math.ceil(self.time_limit) + 1 if self.time_limit else 0
+        if self.launcher:
+            wall_ms = int(self.wall_limit() * 1000) if self.time_limit else 0
+            return [self.launcher, str(stats_fd), str(cpu), str(self.memory_mb * 1024),
+                    str(self.stack_mb * 1024), str(wall_ms), executable, *args]
+        launcher = SHELL_LAUNCHER.format(
+            cpu=cpu or "unlimited",
+            memory=self.memory_mb * 1024 or "unlimited",
+            stack=self.stack_mb * 1024 or "unlimited",
+        )
+        return ['/bin/sh', '-c', launcher, executable, *args]
+
+class RunStats:
+    """How a run ended and what it cost"""
+
+    def __init__(self, status, cpu, max_rss_kb, wall, limits, timed_out=False):
+        self.status = status
+        self.exit_code = os.waitstatus_to_exitcode(status)
+        self.cpu = cpu
+        self.max_rss_kb = max_rss_kb
+        self.wall = wall
+        self.timed_out = timed_out
+        self.verdict = self.classify(limits, timed_out)
+        # Replayed from the run cache rather than run again
+        self.cached = False
+
+    def classify(self, limits, timed_out):
+        if timed_out or self.exit_code == -signal.SIGXCPU:
+            return "TLE"
+        # RLIMIT_CPU is rounded up past the limit, so a run can end over it on its own
+        if limits.time_limit and self.cpu > limits.time_limit:
+            return "TLE"
+        if self.exit_code == 0:
+            return "OK"
+        # RLIMIT_AS fails the allocation before RSS reaches the limit, so a
+        # failure after using over half of it is put down to memory. Without
+        # the launcher the RSS includes the editor's and can't be told apart.
+        if limits.launcher and limits.memory_mb and self.max_rss_kb * 2 >= limits.memory_mb * 1024:
+            return "MLE"
+        return "RE"
+
+    def summary(self):
+        if self.exit_code >= 0:
+            ending = f"exit {self.exit_code}"
+        elif -self.exit_code in signal.valid_signals():
+            ending = signal.Signals(-self.exit_code).name
+        else:
+            ending = f"signal {-self.exit_code}"
+        verdict = "" if self.verdict in ("OK", "RE") else f"{self.verdict}, "
+        cached = " · cached" if self.cached else ""
+        return (f"{verdict}{ending} · {self.wall:.2f}s wall · {self.cpu:.2f}s CPU · "
+                f"{self.max_rss_kb / 1024:.1f} MB{cached}")
+
+def spawn(executable, working_dir, limits, stdin, stdout, stderr, args=()):
+    """Start executable under limits; returns (process, stats_fd) for wait_with_limits"""
+    stats_fd, stats_write = os.pipe()
+    try:
+        # Own session so a kill also reaches anything the program spawned
+        process = subprocess.Popen(
+            limits.command(executable, stats_write, args),
+            cwd=working_dir,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            pass_fds=(stats_write,),
+            start_new_session=True,
+        )
+    except OSError:
+        os.close(stats_fd)
+        raise
+    finally:
+        os.close(stats_write)
+    return process, stats_fd
+
+def kill_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+def stop(process, limits):
+    """Kill a run; through the launcher, so what the program used is still reported"""
+    if limits.launcher:
+        try:
+            os.kill(process.pid, signal.SIGTERM)
+            return
+        except OSError:
+            pass
+    kill_group(process)
+
+def wait_with_limits(process, stats_fd, limits, start):
+    """Reap process with wait4() and return its RunStats"""
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        kill_group(process)
+
+    # A backstop for the launcher, which enforces the wall limit itself
+    timer = None
+    if limits.wall_limit():
+        backstop = limits.wall_limit() + (1 if limits.launcher else 0)
+        timer = threading.Timer(backstop - (time.perf_counter() - start), expire)
+        timer.daemon = True
+        timer.start()
+    try:
+        # Popen.wait() and poll() must not be used meanwhile, or they may reap it first
+        while True:
+            try:
+                _, status, rusage = os.wait4(process.pid, 0)
+                break
+            except InterruptedError:
+                continue
+    finally:
+        if timer:
+            timer.cancel()
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # Anything the program left behind in its group goes with it
+    kill_group(process)
+
+    with os.fdopen(stats_fd, 'rb') as f:
+        report = f.read().split()
+    if limits.launcher and len(report) == 5 and not timed_out.is_set():
+        status, launcher_timed_out, user, system, max_rss_kb = report
+        return RunStats(int(status), float(user) + float(system), int(max_rss_kb), wall,
+                        limits, launcher_timed_out == b"1")
+    return RunStats(status, rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss, wall,
+                    limits, timed_out.is_set())
+
+def run_headless(executable, working_dir, input_path, output_path, limits, on_start=None):
+    """Run once with input_path as stdin and stdout to output_path; returns its RunStats"""
+    with open(input_path, 'rb') as stdin, open(output_path, 'wb') as stdout:
+        start = time.perf_counter()
+        process, stats_fd = spawn(executable, working_dir, limits, stdin, stdout, subprocess.DEVNULL)
+        if on_start:
+            on_start(process)
+        return wait_with_limits(process, stats_fd, limits, start)
+
+def run_piped(executable, working_dir, input_data, limits, args=(), on_start=None):
+    """Run once feeding input_data on stdin; returns (RunStats, stdout bytes)"""
+    start = time.perf_counter()
+    process, stats_fd = spawn(executable, working_dir, limits, subprocess.PIPE, subprocess.PIPE,
+                              subprocess.DEVNULL, args)
+    if on_start:
+        on_start(process)
+    output = []
+
+    def feed():
+        try:
+            process.stdin.write(input_data)
+        except OSError:
+            # The program may exit without reading all of its input
+            pass
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+
+    def drain():
+        output.append(process.stdout.read())
+        process.stdout.close()
+
+    threads = [threading.Thread(target=feed, daemon=True), threading.Thread(target=drain, daemon=True)]
+    for thread in threads:
+        thread.start()
+    stats = wait_with_limits(process, stats_fd, limits, start)
+    for thread in threads:
+        thread.join()
+    return stats, output[0]
@@ -0,0 +1,36 @@
+from PyQt6.QtCore import pyqtSignal
+from utils.build_worker import BuildWorker
+
+class SpeculativeBuild(BuildWorker):
+    """Builds started in the background on save, at low priority"""
+
+    finished = pyqtSignal()
+
+    def __init__(self, builds, nice, jobs):
+        super().__init__(builds, None, None)
+        self.nice = nice
+        self.jobs = jobs
+        self.done = False
+        # Cache keys built successfully, whether or not the GUI has stored them yet
+        self.succeeded = set()
+
+    def run(self):
+        self.compile_all()
+        self.done = True
+        self.finished.emit()
+
+    def compile(self, build):
+        exit_code, diagnostics = super().compile(build)
+        if exit_code == 0:
+            with self.lock:
+                self.succeeded.add(build["cache_key"])
+        return exit_code, diagnostics
+
+    def covers(self, cache_key):
+        """Whether a build with cache_key is still on its way into the compile cache"""
+        if self.stopped:
+            return False
+        for build in self.builds:
+            if build["cache_key"] == cache_key and not build.get("stored"):
+                return not self.done or cache_key in self.succeeded
+        return False
@@ -0,0 +1,94 @@
+from PyQt6.QtCore import pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from utils.build_worker import BuildWorker
+from utils.comparator import compare_bytes
+import os
+import time
+
+GENERATOR_NAMES = ("{stem}_gen.cpp", "gen.cpp", "generator.cpp", "{stem}_gen.py", "gen.py", "generator.py")
+BRUTE_NAMES = ("{stem}_brute.cpp", "brute.cpp", "naive.cpp")
+
+def find_partner(source_path, names):
+    """First of names (with {stem} filled in) that exists next to source_path"""
+    directory = os.path.dirname(source_path)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    for name in names:
+        path = os.path.join(directory, name.format(stem=stem))
+        if os.path.isfile(path) and os.path.abspath(path) != os.path.abspath(source_path):
+            return path
+    return None
+
+class StressTester(BuildWorker):
+    """Runs generator, brute force and solution on seeded inputs, on every core, until they disagree"""
+
+    mismatch = pyqtSignal(int, bytes, bytes, bytes, str)
+    finished = pyqtSignal()
+
+    def __init__(self, builds, generator, brute, solution, working_dir, limits, iterations, tolerance=None):
+        super().__init__(builds, working_dir, limits)
+        self.tolerance = tolerance
+        self.generator = generator
+        self.brute = brute
+        self.solution = solution
+        self.iterations = iterations
+        self.next_seed = 1
+        self.completed = 0
+        self.started_at = None
+        self.failed = False
+
+    def run(self):
+        if self.compile_all():
+            self.started_at = time.perf_counter()
+            workers = max(1, min(self.iterations, os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for _ in range(workers):
+                    pool.submit(self.work)
+        self.finished.emit()
+
+    def take_seed(self):
+        with self.lock:
+            if self.stopped or self.next_seed > self.iterations:
+                return None
+            seed = self.next_seed
+            self.next_seed += 1
+            return seed
+
+    def work(self):
+        while True:
+            seed = self.take_seed()
+            if seed is None:
+                return
+            try:
+                self.iterate(seed)
+            except OSError as e:
+                self.report(seed, b"", b"", b"", f"could not run ({e})")
+
+    def iterate(self, seed):
+        stats, data = self.execute(self.generator[0], b"", (*self.generator[1:], str(seed)))
+        if stats.verdict != "OK":
+            return self.report(seed, data, b"", b"", f"generator {stats.verdict}")
+        stats, expected = self.execute(self.brute, data)
+        if stats.verdict != "OK":
+            return self.report(seed, data, expected, b"", f"brute force {stats.verdict}")
+        stats, actual = self.execute(self.solution, data)
+        if stats.verdict != "OK":
+            return self.report(seed, data, expected, actual, stats.verdict)
+        difference = compare_bytes(actual, expected, self.tolerance)
+        if difference:
+            return self.report(seed, data, expected, actual, f"WA ({difference})")
+        with self.lock:
+            self.completed += 1
+
+    def report(self, seed, data, expected, actual, reason):
+        with self.lock:
+            if self.stopped:
+                return
+            self.stopped = True
+            self.failed = True
+        self.mismatch.emit(seed, data, expected, actual, reason)
+        self.kill_all()
+
+    def rate(self):
+        if not self.started_at:
+            return 0.0
+        return self.completed / max(time.perf_counter() - self.started_at, 1e-6)
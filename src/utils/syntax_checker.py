@@ -0,0 +1,154 @@
+from PyQt6.QtCore import QProcess, QTimer
+from utils.properties import *
+from utils.pch_cache import PCH_HEADER
+import json
+import os
+import re
+import shlex
+import weakref
+
+STDIN_NAME = "<stdin>"
+SEVERITIES = {"error": "error", "fatal error": "error", "warning": "warning"}
+# What older compilers, or g++ failing before it gets to JSON, print instead
+TEXT_DIAGNOSTIC = re.compile(r"^<stdin>:(\d+):(\d+): (fatal error|error|warning): (.*)$", re.MULTILINE)
+
+class Diagnostic:
+    """A compiler message at a 1-based line and byte column; the end is exclusive, or None when unknown"""
+
+    def __init__(self, kind, line, column, end_line=None, end_column=None, message=""):
+        self.kind = kind
+        self.line = line
+        self.column = column
+        self.end_line = end_line
+        self.end_column = end_column
+        self.message = message
+
+    def __str__(self):
+        return f"{self.line}:{self.column}: {self.kind}: {self.message}"
+
+def column(point):
+    return point.get("byte-column", point.get("column", 1))
+
+def locate(item):
+    """(start, finish) of the first location in the checked text, looking into the notes too"""
+    # An error inside a header, like a bad template instantiation, goes where the notes say the text led to it
+    for entry in [item] + item.get("children", []):
+        for location in entry.get("locations", []):
+            caret = location.get("caret", {})
+            if caret.get("file") == STDIN_NAME:
+                return location.get("start", caret), location.get("finish")
+    return None
+
+def parse_diagnostics(output):
+    """Diagnostics from the output of g++ -fdiagnostics-format=json, errors and warnings only"""
+    try:
+        items = json.loads(output)
+    except ValueError:
+        return [Diagnostic(SEVERITIES[kind], int(line), int(col), message=message)
+                for line, col, kind, message in TEXT_DIAGNOSTIC.findall(output)]
+    diagnostics = []
+    for item in items:
+        kind = SEVERITIES.get(item.get("kind"))
+        location = locate(item)
+        if not kind or not location:
+            continue
+        start, finish = location
+        diagnostic = Diagnostic(kind, start["line"], column(start), message=item.get("message", ""))
+        if finish:
+            diagnostic.end_line = finish["line"]
+            diagnostic.end_column = column(finish) + 1
+        diagnostics.append(diagnostic)
+    return diagnostics
+
+class SyntaxChecker:
+    """Runs g++ -fsyntax-only over an editor's text once typing pauses and shows the result in it"""
+
+    def __init__(self, pch_cache):
+        self.pch_cache = pch_cache
+        self.editor = None
+        self.process = None
+        self.attached = weakref.WeakSet()
+        # Killed checks, kept until they are reaped
+        self.running = set()
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+    def attach(self, editor):
+        """Check editor whenever its text changes; attaching it again does nothing"""
+        if editor in self.attached:
+            return
+        self.attached.add(editor)
+        editor.textChanged.connect(lambda: self.schedule(editor))
+
+    def schedule(self, editor):
+        # A running check is out of date, so there is never more than one
+        self.cancel()
+        if not IDLE_CHECK or not editor:
+            return
+        self.editor = editor
+        self.timer.start(IDLE_CHECK_DELAY_MS)
+
+    def cancel(self):
+        self.timer.stop()
+        if self.process:
+            self.process.kill()
+            self.process = None
+
+    def shutdown(self):
+        """Stop checking and reap every check still running, before the application exits"""
+        self.cancel()
+        for process in list(self.running):
+            process.kill()
+            process.waitForFinished(1000)
+
+    def command(self, text):
+        """(compiler, arguments) checking text with the release build's flags, or None"""
+        command = self.pch_cache.split_command(COMPILE_RELEASE_CMD)
+        if not command:
+            return None
+        compiler, flags = command
+        if COMPILE_USE_PCH and PCH_HEADER in text:
+            # Same flags as the release build, so its PCH applies
+            flags = flags + shlex.split(self.pch_cache.include_flag(COMPILE_RELEASE_CMD))
+        return compiler, flags + ["-fsyntax-only", "-fdiagnostics-format=json"]
+
+    def check(self):
+        editor = self.editor
+        path = editor.file_path
+        if not path or not path.lower().endswith('.cpp'):
+            editor.set_diagnostics([])
+            return
+        text = editor.text()
+        command = self.command(text)
+        if not command:
+            return
+        compiler, args = command
+        directory = os.path.dirname(path)
+
+        process = QProcess()
+        process.setWorkingDirectory(directory)
+        process.finished.connect(lambda exit_code, exit_status: self.on_finished(process, editor, exit_status))
+        process.errorOccurred.connect(lambda error: self.on_error(process, error))
+        self.process = process
+        self.running.add(process)
+        # Through stdin, so unsaved changes are checked too
+        process.start(compiler, args + ["-iquote", directory, "-x", "c++", "-"])
+        process.write(text.encode('utf-8'))
+        process.closeWriteChannel()
+
+    def on_error(self, process, error):
+        # A process that never started emits no finished
+        if error == QProcess.ProcessError.FailedToStart:
+            self.on_finished(process, None, QProcess.ExitStatus.CrashExit)
+
+    def on_finished(self, process, editor, exit_status):
+        self.running.discard(process)
+        process.deleteLater()
+        if process is not self.process:
+            return
+        self.process = None
+        if exit_status != QProcess.ExitStatus.NormalExit:
+            return
+        output = bytes(process.readAllStandardError()).decode('utf-8', errors='replace')
+        editor.set_diagnostics(parse_diagnostics(output))
@@ -0,0 +1,171 @@
+from PyQt6.QtCore import pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from utils.build_worker import BuildWorker
+from utils.comparator import compare_bytes
+import os
+
+MAX_PROBES = 20000
+HEADER_TOKENS = 4
+RECORD_LINES = (1, 2, 3)
+
+def parse_input(data):
+    return [line.split() for line in data.splitlines()]
+
+def render_input(lines):
+    return b"".join(b" ".join(tokens) + b"\n" for tokens in lines)
+
+def decrement(lines, line, index, amount):
+    """Copy of lines with the integer token at (line, index) lowered by amount, or None"""
+    token = lines[line][index]
+    if not token.isdigit() or int(token) < amount:
+        return None
+    adjusted = list(lines)
+    adjusted[line] = list(lines[line])
+    adjusted[line][index] = str(int(token) - amount).encode()
+    return adjusted
+
+class TestMinimizer(BuildWorker):
+    """Shrinks a failing input by delta debugging for as long as it keeps failing the same way"""
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object, object, str)
+
+    def __init__(self, builds, solution, brute, working_dir, limits, data, expected=None, tolerance=None):
+        super().__init__(builds, working_dir, limits)
+        self.tolerance = tolerance
+        self.solution = solution
+        self.brute = brute
+        self.data = data
+        self.expected = expected
+        self.reason = None
+        self.probes = 0
+        self.plain = False
+        self.workers = os.cpu_count() or 1
+
+    def run(self):
+        if not self.compile_all():
+            self.finished.emit(None, None, "")
+            return
+        self.reason = self.failure(self.data, self.expected)
+        if not self.reason:
+            self.finished.emit(None, None, "the test does not fail")
+        elif self.reason == "WA" and not self.brute:
+            self.finished.emit(None, None, "a wrong answer can only be minimized with a brute force solution")
+        else:
+            self.lines = parse_input(self.data)
+            with ThreadPoolExecutor(max_workers=self.workers) as self.pool:
+                self.minimize()
+            data = render_input(self.lines)
+            expected = self.execute(self.brute, data)[1] if self.brute else None
+            self.finished.emit(data, expected, self.reason)
+
+    def failure(self, data, expected=None):
+        """Verdict of the solution on data, "WA" if it disagrees with the expected output, or None"""
+        stats, actual = self.execute(self.solution, data)
+        if stats.verdict != "OK":
+            return stats.verdict
+        if self.brute:
+            stats, expected = self.execute(self.brute, data)
+            if stats.verdict != "OK":
+                # Not a valid input any more
+                return None
+        if expected is not None and compare_bytes(actual, expected, self.tolerance):
+            return "WA"
+        return None
+
+    def reproduces(self, lines):
+        if self.stopped:
+            return False
+        return self.failure(render_input(lines)) == self.reason
+
+    def first_reproducing(self, candidates):
+        """First candidate, in order, that still fails; probed a window at a time"""
+        window = []
+        for candidate in candidates:
+            if candidate is not None:
+                window.append(candidate)
+            if len(window) == self.workers:
+                found = self.probe(window)
+                if found:
+                    return found
+                window = []
+        return self.probe(window) if window else None
+
+    def probe(self, window):
+        if self.stopped or self.probes >= MAX_PROBES:
+            return None
+        self.probes += len(window)
+        for candidate, failed in zip(window, self.pool.map(self.reproduces, window)):
+            if failed:
+                return candidate
+        return None
+
+    def reduce(self, count, candidates):
+        """ddmin over count units; candidates(a, b) yields versions without units [a, b)"""
+        changed = False
+        parts = 2
+        while count() > 0 and not self.stopped and self.probes < MAX_PROBES:
+            size = -(-count() // parts)
+            removals = [(start, min(start + size, count())) for start in range(0, count(), size)]
+            found = self.first_reproducing(
+                candidate for start, end in removals for candidate in candidates(start, end))
+            if found:
+                self.lines = found
+                changed = True
+                parts = max(parts - 1, 2)
+                self.progress.emit(len(render_input(self.lines)), self.probes)
+            elif size == 1:
+                break
+            else:
+                parts = min(parts * 2, count())
+        return changed
+
+    def header_positions(self, line):
+        """(line, index, value) of integers on earlier lines that may count what is removed at line, likeliest first"""
+        positions = []
+        for header in sorted({line - 1, line - 2, 0}, reverse=True):
+            if 0 <= header < line:
+                for index, token in enumerate(self.lines[header][:HEADER_TOKENS]):
+                    if token.isdigit():
+                        positions.append((header, index, int(token)))
+        return positions
+
+    def without_lines(self, start, end):
+        # So the input stays well formed, removing k lines also lowers a count
+        # of 1-3 line records that hold them. Shifted by one as well, for records that start after a header line
+        for start, end in ((start, end), (start + 1, end + 1)):
+            if end > len(self.lines):
+                continue
+            base = self.lines[:start] + self.lines[end:]
+            for line, index, value in self.header_positions(start):
+                for record in RECORD_LINES:
+                    if (end - start) % record:
+                        continue
+                    # The records counted start right after the count, or after one more line such as an array
+                    for first in (line + 1, line + 2):
+                        if first <= start and end <= first + value * record <= len(self.lines):
+                            yield decrement(base, line, index, (end - start) // record)
+                            break
+            if self.plain:
+                yield base
+
+    def without_tokens(self, line, start, end):
+        base = list(self.lines)
+        base[line] = self.lines[line][:start] + self.lines[line][end:]
+        # Only a count equal to the line's length is lowered with it
+        for header, index, value in self.header_positions(line):
+            if value == len(self.lines[line]):
+                yield decrement(base, header, index, end - start)
+        if self.plain:
+            yield base
+
+    def minimize(self):
+        # Removals that leave the counts alone are only tried once the others stop shrinking the input
+        for self.plain in (False, True):
+            changed = True
+            while changed and not self.stopped:
+                changed = self.reduce(lambda: len(self.lines), self.without_lines)
+                for line in range(len(self.lines)):
+                    if len(self.lines[line]) > 1:
+                        changed |= self.reduce(lambda: len(self.lines[line]),
+                                               lambda start, end: self.without_tokens(line, start, end))
@@ -0,0 +1,65 @@
+from PyQt6.QtCore import pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from utils.build_worker import BuildWorker
+from utils.comparator import Judge
+from utils.run_limits import run_headless
+import os
+
+class TestRunner(BuildWorker):
+    """Runs one executable against many inputs in parallel, one process per core"""
+
+    # index, verdict, seconds, message; the verdict is AC, WA, TLE, MLE, RE,
+    # FAIL when the checker breaks, or OK when a test has no expected output
+    test_finished = pyqtSignal(int, str, float, str)
+    finished = pyqtSignal()
+
+    def __init__(self, executable, working_dir, tests, output_dir, limits, judge=None, builds=()):
+        super().__init__(list(builds), working_dir, limits)
+        self.executable = executable
+        self.tests = tests
+        self.output_dir = output_dir
+        self.judge = judge or Judge()
+
+    def output_path(self, index):
+        return os.path.join(self.output_dir, self.tests[index][0] + ".out")
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.compile_all():
+            workers = max(1, min(len(self.tests), os.cpu_count() or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for future in [pool.submit(self.run_test, index) for index in range(len(self.tests))]:
+                    future.exception()
+        self.finished.emit()
+
+    def run_test(self, index):
+        name, input_path, expected_path = self.tests[index]
+        if self.stopped:
+            return
+        message = ""
+        try:
+            verdict, elapsed = self.run_input(index, input_path)
+            if verdict == "OK" and expected_path:
+                verdict, message = self.judge.judge(input_path, self.output_path(index), expected_path)
+        except OSError as e:
+            verdict, elapsed, message = "RE", 0.0, str(e)
+        self.test_finished.emit(index, verdict, elapsed, message)
+
+    def run_input(self, index, input_path):
+        processes = []
+
+        def register(process):
+            processes.append(process)
+            with self.lock:
+                self.running.add(process)
+
+        try:
+            stats = run_headless(self.executable, self.working_dir, input_path,
+                                 self.output_path(index), self.limits, on_start=register)
+        finally:
+            with self.lock:
+                self.running.difference_update(processes)
+
+        if self.stopped and stats.verdict != "OK":
+            return "--", stats.wall
+        return stats.verdict, stats.wall
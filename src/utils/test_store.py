@@ -0,0 +1,179 @@
+import gzip
+import json
+import os
+import re
+import shutil
+
+INDEX_FILE = "index.json"
+OUTPUT_FILE_NAME = ".output"
+EXPECTED_EXTENSIONS = (".out", ".ans")
+
+def natural_key(name):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+def open_test_file(path):
+    return gzip.open(path, 'rb') if path.endswith(".gz") else open(path, 'rb')
+
+def uncompressed_size(path):
+    if not path.endswith(".gz"):
+        return os.path.getsize(path)
+    # gzip keeps the uncompressed size modulo 2^32 in its last four bytes
+    with open(path, 'rb') as f:
+        f.seek(-4, os.SEEK_END)
+        return int.from_bytes(f.read(4), 'little')
+
+class TestStore:
+    """Test cases owned by one source file, kept in tests/<stem>/ next to it"""
+
+    def __init__(self, source_path, compress_above=1024 * 1024):
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        self.directory = os.path.join(os.path.dirname(os.path.abspath(source_path)), "tests", stem)
+        self.compress_above = compress_above
+        self.index = None
+
+    def load_index(self):
+        if self.index is not None:
+            return self.index
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), 'r') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {"active": None, "tests": self.discover()}
+            if self.index["tests"]:
+                self.index["active"] = self.index["tests"][0]["name"]
+        return self.index
+
+    def discover(self):
+        # Tests written by hand as *.in with .out or .ans are indexed on first use
+        if not os.path.isdir(self.directory):
+            return []
+        files = set(os.listdir(self.directory))
+        tests = []
+        for file_name in sorted(files, key=natural_key):
+            if file_name.endswith(".in.gz"):
+                name = file_name[:-6]
+            elif file_name.endswith(".in"):
+                name = file_name[:-3]
+            else:
+                continue
+            expected = None
+            for extension in EXPECTED_EXTENSIONS:
+                for candidate in (name + extension, name + extension + ".gz"):
+                    if candidate in files and not expected:
+                        expected = candidate
+            tests.append({
+                "name": name,
+                "input": file_name,
+                "expected": expected,
+                "input_size": uncompressed_size(os.path.join(self.directory, file_name)),
+            })
+        return tests
+
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        staging = os.path.join(self.directory, INDEX_FILE + ".tmp")
+        with open(staging, 'w') as f:
+            json.dump(self.load_index(), f, indent=4)
+        os.replace(staging, os.path.join(self.directory, INDEX_FILE))
+
+    def tests(self):
+        return self.load_index()["tests"]
+
+    def test(self, name):
+        for test in self.tests():
+            if test["name"] == name:
+                return test
+        return None
+
+    def active(self):
+        return self.test(self.load_index()["active"])
+
+    def set_active(self, name):
+        self.load_index()["active"] = name
+        self.save_index()
+
+    def path(self, file_name):
+        return os.path.join(self.directory, file_name) if file_name else None
+
+    def output_path(self, create=False):
+        """Last run's output for this source, kept with its tests; create makes its directory for writing"""
+        if create:
+            os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, OUTPUT_FILE_NAME)
+
+    def add_test(self, input_data=b"", expected_data=None):
+        names = [test["name"] for test in self.tests()]
+        number = 1 + max([int(name) for name in names if name.isdigit()] or [0])
+        test = {"name": str(number), "input": None, "expected": None, "input_size": 0}
+        self.tests().append(test)
+        self.write(test, "input", input_data)
+        if expected_data is not None:
+            self.write(test, "expected", expected_data)
+        self.load_index()["active"] = test["name"]
+        self.save_index()
+        return test
+
+    def remove_test(self, name):
+        test = self.test(name)
+        if not test:
+            return
+        for key in ("input", "expected"):
+            if test[key]:
+                try:
+                    os.remove(self.path(test[key]))
+                except OSError:
+                    pass
+        index = self.load_index()
+        index["tests"].remove(test)
+        if index["active"] == name:
+            index["active"] = index["tests"][0]["name"] if index["tests"] else None
+        self.save_index()
+
+    def write(self, test, key, data):
+        """Store a test's input or expected output, compressing it when large"""
+        os.makedirs(self.directory, exist_ok=True)
+        extension = ".in" if key == "input" else ".out"
+        file_name = test["name"] + extension
+        if len(data) > self.compress_above:
+            file_name += ".gz"
+        staging = self.path(file_name) + ".tmp"
+        if file_name.endswith(".gz"):
+            with gzip.open(staging, 'wb', compresslevel=1) as f:
+                f.write(data)
+        else:
+            with open(staging, 'wb') as f:
+                f.write(data)
+        os.replace(staging, self.path(file_name))
+
+        if test[key] and test[key] != file_name:
+            try:
+                os.remove(self.path(test[key]))
+            except OSError:
+                pass
+        test[key] = file_name
+        if key == "input":
+            test["input_size"] = len(data)
+        self.save_index()
+
+    def plain_path(self, file_name, cache_dir):
+        """A path to the uncompressed file, decompressing gzipped tests into cache_dir"""
+        path = self.path(file_name)
+        if not file_name.endswith(".gz"):
+            return path
+        os.makedirs(cache_dir, exist_ok=True)
+        plain = os.path.join(cache_dir, file_name[:-3])
+        if not os.path.exists(plain) or os.path.getmtime(plain) < os.path.getmtime(path):
+            with gzip.open(path, 'rb') as source, open(plain + ".tmp", 'wb') as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            os.replace(plain + ".tmp", plain)
+        return plain
+
+    def test_cases(self, cache_dir):
+        """(name, input_path, expected_path or None) for every test, ready to run"""
+        cases = []
+        for test in self.tests():
+            if not test["input"]:
+                continue
+            expected = self.path(test["expected"]) if test["expected"] else None
+            cases.append((test["name"], self.plain_path(test["input"], cache_dir), expected))
+        return cases
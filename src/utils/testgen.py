@@ -0,0 +1,102 @@
+"""Random test generation for competitive programming inputs, importable from gen.py:
+
+    from testgen import TestGen, line, edges, write
+    gen = TestGen()                 # seeded from argv[1]
+    n = gen.randint(1, 10)
+    write(n, line(gen.array(n, 1, 100)))
+"""
+import os
+import random
+import string
+import sys
+
+LOWERCASE = string.ascii_lowercase
+# Reducing 64-bit words modulo a span up to this size is biased by less than 2^-32
+BULK_SPAN = 2 ** 32
+# Runs a generator script with this module importable and argv as if it were run directly
+BOOTSTRAP = ("import runpy, sys; sys.path.insert(0, sys.argv[1]); sys.argv = sys.argv[2:]; "
+             "runpy.run_path(sys.argv[0], run_name='__main__')")
+
+class TestGen:
+    """Random structures from one seed; the same seed always gives the same test"""
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+        self.random = random.Random(seed)
+
+    def randint(self, low, high):
+        return self.random.randint(low, high)
+
+    def words(self, n):
+        """n random 64-bit integers from a single call into the generator, far faster than n randint() calls"""
+        return memoryview(self.random.randbytes(8 * n)).cast('Q').tolist()
+
+    def array(self, n, low, high):
+        """n integers uniform in [low, high]"""
+        if low > high:
+            raise ValueError(f"empty range [{low}, {high}]")
+        span = high - low + 1
+        if span <= BULK_SPAN:
+            return [low + word % span for word in self.words(n)]
+        return [self.random.randint(low, high) for _ in range(n)]
+
+    def distinct(self, n, low, high):
+        """n distinct integers from [low, high] in random order"""
+        return self.random.sample(range(low, high + 1), n)
+
+    def permutation(self, n, start=1):
+        values = list(range(start, start + n))
+        self.random.shuffle(values)
+        return values
+
+    def string(self, n, alphabet=LOWERCASE):
+        return "".join(self.random.choices(alphabet, k=n))
+
+    def tree(self, n, start=1):
+        """Edges of a random tree on n vertices, in random order and orientation"""
+        # Each vertex hangs off a random earlier one, with labels shuffled
+        labels = self.permutation(n, start)
+        words = self.words(2 * n)
+        edges = [(labels[i], labels[word % i]) for i, word in zip(range(1, n), words)]
+        self.random.shuffle(edges)
+        return [(v, u) if flip & 1 else (u, v) for (u, v), flip in zip(edges, words[n:])]
+
+    def graph(self, n, m, start=1, connected=True):
+        """m edges of a simple undirected graph, spanning all n vertices when connected"""
+        if m > n * (n - 1) // 2 or (connected and m < n - 1):
+            raise ValueError(f"no simple {'connected ' if connected else ''}graph has {n} vertices and {m} edges")
+        result = self.tree(n, start) if connected else []
+        seen = {u * n + v if u < v else v * n + u for u, v in result}
+        while len(result) < m:
+            # Endpoints are drawn for all missing edges at once; collisions are redrawn next round
+            ends = self.array(2 * (m - len(result)), start, start + n - 1)
+            for u, v in zip(ends[::2], ends[1::2]):
+                key = u * n + v if u < v else v * n + u
+                if u != v and key not in seen:
+                    seen.add(key)
+                    result.append((u, v))
+        self.random.shuffle(result)
+        return result[:m]
+
+    def tests(self, t, case):
+        """t test cases from case(gen), with their count on the first line"""
+        return "\n".join([str(t)] + [case(self) for _ in range(t)])
+
+def line(values):
+    return " ".join(map(str, values))
+
+def edges(pairs):
+    return "\n".join(f"{u} {v}" for u, v in pairs)
+
+def render(*parts):
+    return "\n".join(map(str, parts)) + "\n"
+
+def write(*parts):
+    """Print parts on their own lines with a single write"""
+    sys.stdout.write(render(*parts))
+    sys.stdout.flush()
+
+def script_command(path):
+    """Command that runs the Python generator at path; the seed is appended to it"""
+    return [sys.executable, "-c", BOOTSTRAP, os.path.dirname(os.path.abspath(__file__)), path]
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.comparator import Tolerance, compare_bytes
+
+
+def test_integers_compare_exactly():
+    tolerance = Tolerance(2, 0)
+    assert compare_bytes(b"5\n", b"5\n", tolerance) is None
+    assert compare_bytes(b"5\n", b"4\n", tolerance) is not None
+
+
+def test_negative_integers_compare_exactly():
+    tolerance = Tolerance(2, 0)
+    assert compare_bytes(b"-5\n", b"-5\n", tolerance) is None
+    assert compare_bytes(b"-5\n", b"-4\n", tolerance) is not None
+    assert compare_bytes(b"+3\n", b"3\n", tolerance) is not None
+
+
+def test_floats_within_tolerance():
+    assert compare_bytes(b"0.1000001\n", b"0.1\n", Tolerance(1e-6, 0)) is None
+    assert compare_bytes(b"-2.5\n", b"-2.4\n", Tolerance(0.2, 0)) is None
+    assert compare_bytes(b"100.5\n", b"100\n", Tolerance(0, 0.01)) is None
+
+
+def test_floats_outside_tolerance():
+    assert compare_bytes(b"0.11\n", b"0.1\n", Tolerance(1e-6, 0)) is not None
+    assert compare_bytes(b"102\n", b"100.0\n", Tolerance(0, 0.01)) is not None
+
+
+def test_exact_without_tolerance():
+    assert compare_bytes(b"1.0\n", b"1.00\n", Tolerance()) is not None
+    assert compare_bytes(b"1 2  3\n", b"1 2 3", Tolerance()) is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.run_limits import RunLimits, run_piped
+
+# Spins for about 0.3s of CPU time, then exits normally
+SPIN = """
+#include <ctime>
+int main() {
+    while (std::clock() < CLOCKS_PER_SEC * 3 / 10) {}
+    return 0;
+}
+"""
+
+
+def test_finishing_just_over_the_limit_is_tle():
+    compiler = shutil.which("g++")
+    if not compiler:
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "spin.cpp")
+        executable = os.path.join(directory, "spin")
+        with open(source, 'w') as f:
+            f.write(SPIN)
+        subprocess.run([compiler, "-O2", "-o", executable, source], check=True)
+
+        stats, _ = run_piped(executable, directory, b"", RunLimits(time_limit=0.2))
+        assert stats.exit_code == 0
+        assert stats.verdict == "TLE"
+
+        stats, _ = run_piped(executable, directory, b"", RunLimits(time_limit=2))
+        assert stats.verdict == "OK"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()